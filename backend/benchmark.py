@@ -0,0 +1,222 @@
+"""Замеры движков на уровнях из frontend/src/levels.
+
+Каждый движок решает каждый уровень; для уровня записываются время,
+раскрытые и сохранённые состояния и пиковая память (tracemalloc, отдельным
+прогоном, чтобы трассировка не искажала время). Все движки ходят с одной
+семантикой — до упора или, с --all-slides, на любое расстояние, — поэтому
+длины решений у них должны совпадать. Результаты группируются
+по размеру поля и сложности и сохраняются в JSON; с --baseline итоги
+сравниваются с прошлым прогоном.
+
+Запуск из каталога backend:
+    python benchmark.py --engines bfs,astar --sizes 6x6 --limit 10
+"""
+import argparse
+import glob
+import io
+import json
+import os
+import platform
+import re
+import sys
+import time
+import tracemalloc
+
+from rushhour import Board, ENGINES, make_engine, size_for_config
+
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+LEVELS_DIR = "../frontend/src/levels"
+DIFFICULTIES = ('easy', 'medium', 'hard')
+# Во сколько раз итог может вырасти относительно базового прогона без предупреждения
+REGRESSION_RATIO = 1.2
+# Более короткие суммарные времена слишком шумные для сравнения
+MIN_COMPARED_TIME = 0.1
+
+
+def load_levels(levels_dir=LEVELS_DIR):
+    """Уровни из .js-файлов: список (размер, сложность, файл, конфигурация).
+
+    Сложность берётся из имени файла, размер — из длины строки, поэтому
+    старые файлы без размера в имени (easy.js) тоже учитываются.
+    """
+    levels = []
+    for path in sorted(glob.glob(os.path.join(levels_dir, '*.js'))):
+        name = os.path.basename(path)
+        difficulty = name.split('.')[0].split('_')[0]
+        if difficulty not in DIFFICULTIES:
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            for config in re.findall(r'"([^"]+)"', f.read()):
+                try:
+                    size = size_for_config(config)
+                except ValueError:
+                    continue
+                levels.append((size, difficulty, name, config))
+    return levels
+
+
+def run_engine(name, config, size, options, all_slides=False):
+    board = Board(config, size, all_slides)
+    engine = make_engine(name, board, **options)
+    start = time.perf_counter()
+    steps = engine.search(want_path=False)
+    elapsed = time.perf_counter() - start
+    return steps, elapsed, engine
+
+
+def measure(name, config, size, options, memory, all_slides=False):
+    """Один замер: время и счётчики без трассировки, память — отдельным прогоном"""
+    steps, elapsed, engine = run_engine(name, config, size, options, all_slides)
+    record = {
+        'engine': name,
+        'steps': steps,
+        'time': elapsed,
+        'nodes': engine.nodes_expanded,
+        'states': engine.states_stored,
+        'peak_kb': None,
+    }
+    if memory:
+        tracemalloc.start()
+        run_engine(name, config, size, options, all_slides)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        record['peak_kb'] = peak / 1024
+    return record
+
+
+def summarize(results):
+    """Итоги по (размер, сложность, движок)"""
+    summary = {}
+    for r in results:
+        group = summary.setdefault(r['size'], {}).setdefault(r['difficulty'], {})
+        total = group.setdefault(r['engine'], {
+            'levels': 0, 'unsolved': 0, 'time': 0.0, 'nodes': 0, 'states': 0, 'max_peak_kb': None})
+        total['levels'] += 1
+        total['unsolved'] += r['steps'] is None
+        total['time'] += r['time']
+        total['nodes'] += r['nodes']
+        total['states'] += r['states']
+        if r['peak_kb'] is not None:
+            total['max_peak_kb'] = max(total['max_peak_kb'] or 0, r['peak_kb'])
+    return summary
+
+
+def mismatches(results):
+    """Уровни, где движки дали разную длину решения"""
+    lengths = {}
+    for r in results:
+        lengths.setdefault(r['level'], {})[r['engine']] = r['steps']
+    return [(level, found) for level, found in lengths.items() if len(set(found.values())) > 1]
+
+
+def compare(summary, baseline, ratio=REGRESSION_RATIO):
+    """Строки о группах, где время или число узлов выросло больше чем в ratio раз"""
+    lines = []
+    for size, groups in summary.items():
+        for difficulty, engines in groups.items():
+            for engine, total in engines.items():
+                old = baseline.get(size, {}).get(difficulty, {}).get(engine)
+                if not old or old['levels'] != total['levels']:
+                    continue
+                for metric in ('time', 'nodes'):
+                    if metric == 'time' and old['time'] < MIN_COMPARED_TIME:
+                        continue
+                    if old[metric] and total[metric] > old[metric] * ratio:
+                        lines.append(f"{size} {difficulty} {engine}: {metric} "
+                                     f"{old[metric]:.6g} → {total[metric]:.6g} "
+                                     f"(×{total[metric] / old[metric]:.2f})")
+    return lines
+
+
+def print_summary(summary):
+    for size in sorted(summary):
+        for difficulty in DIFFICULTIES:
+            for engine, total in summary[size].get(difficulty, {}).items():
+                peak = total['max_peak_kb']
+                peak = f"{peak:.0f} KB" if peak is not None else "—"
+                print(f"{size} {difficulty:6} {engine:13} уровней {total['levels']:3}  "
+                      f"время {total['time']:8.3f} сек  узлов {total['nodes']:9}  "
+                      f"состояний {total['states']:9}  пик памяти {peak}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замеры движков на уровнях игры")
+    parser.add_argument('--engines', default=','.join(ENGINES),
+                        help="движки через запятую (по умолчанию все)")
+    parser.add_argument('--sizes', default='5x5,6x6,7x7', help="размеры поля через запятую")
+    parser.add_argument('--difficulties', default=','.join(DIFFICULTIES))
+    parser.add_argument('--limit', type=int, default=None,
+                        help="не больше N уровней на размер и сложность")
+    parser.add_argument('--heuristic', default=None, help="эвристика для astar и ida")
+    parser.add_argument('--all-slides', action='store_true',
+                        help="сдвигать машины на любое расстояние, а не до упора")
+    parser.add_argument('--no-memory', action='store_true', help="не замерять пиковую память")
+    parser.add_argument('--levels-dir', default=LEVELS_DIR)
+    parser.add_argument('--output', default='benchmark.json')
+    parser.add_argument('--baseline', default=None, help="JSON прошлого прогона для сравнения")
+    parser.add_argument('--ratio', type=float, default=REGRESSION_RATIO,
+                        help="допустимый рост времени и числа узлов относительно --baseline")
+    args = parser.parse_args()
+
+    engines = args.engines.split(',')
+    for name in engines:
+        if name not in ENGINES:
+            parser.error(f"неизвестный движок: {name}")
+    sizes = set(args.sizes.split(','))
+    difficulties = set(args.difficulties.split(','))
+    options = {'heuristic': args.heuristic} if args.heuristic else {}
+
+    taken = {}
+    results = []
+    for size, difficulty, source, config in load_levels(args.levels_dir):
+        if size not in sizes or difficulty not in difficulties:
+            continue
+        group = (size, difficulty)
+        if args.limit is not None and taken.get(group, 0) >= args.limit:
+            continue
+        taken[group] = taken.get(group, 0) + 1
+
+        for name in engines:
+            engine_options = options if name in ('astar', 'ida') else {}
+            record = measure(name, config, size, engine_options, not args.no_memory, args.all_slides)
+            record.update(size=size, difficulty=difficulty, file=source, level=config)
+            results.append(record)
+            print(f"{size} {difficulty} {name}: {record['steps']} шагов, "
+                  f"{record['time']:.4f} сек, {record['nodes']} узлов", flush=True)
+
+    summary = summarize(results)
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'engines': engines,
+            'options': options,
+            'all_slides': args.all_slides,
+        },
+        'summary': summary,
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+
+    print()
+    print_summary(summary)
+
+    for level, found in mismatches(results):
+        print(f"Разные длины решения для {level}: {found}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(summary, json.load(f)['summary'], args.ratio)
+        for line in regressions:
+            print(f"Регрессия: {line}")
+        if regressions:
+            sys.exit(1)
+
+    print(f"\nРезультаты сохранены в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
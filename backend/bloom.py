@@ -0,0 +1,91 @@
+"""Фильтр Блума в общей памяти для уже виденных конфигураций.
+
+Все процессы генерации отмечают в одном фильтре каждую конфигурацию,
+которую собираются решать, и пропускают уже отмеченные, так что один
+уровень не решается дважды ни в одном процессе. Размер фильтра задаётся
+заранее и не растёт: при capacity элементах доля ложных срабатываний
+равна error_rate, дальше она плавно растёт. Ложное срабатывание лишь
+отбрасывает нового кандидата.
+
+Биты ставятся без блокировок: если два процесса одновременно меняют один
+байт, бит одного из них может потеряться, и конфигурация когда-нибудь
+решится повторно. Для генератора это дешевле блокировки на каждую
+проверку; точную проверку повторов сохранённых уровней делает
+координатор.
+"""
+import hashlib
+import math
+import os
+from multiprocessing import shared_memory
+
+DEFAULT_CAPACITY = 10_000_000
+DEFAULT_ERROR_RATE = 0.01
+
+
+def filter_params(capacity, error_rate):
+    """Число бит и хэш-функций для capacity элементов с долей ошибок error_rate"""
+    bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+class SharedBloomFilter:
+    def __init__(self, capacity=DEFAULT_CAPACITY, error_rate=DEFAULT_ERROR_RATE, name=None):
+        """Создаёт фильтр; name=None — имя выбирается автоматически.
+
+        Фильтр передаётся рабочим как аргумент Process: при fork он
+        наследуется, при spawn распаковывается и подключается к той же
+        памяти по имени.
+        """
+        self.bits, self.hashes = filter_params(capacity, error_rate)
+        self.memory = shared_memory.SharedMemory(name=name, create=True, size=(self.bits + 7) // 8)
+        # При fork объект наследуется как есть, поэтому владелец — процесс, а не флаг
+        self.owner = os.getpid()
+
+    @classmethod
+    def attach(cls, name, bits, hashes):
+        self = cls.__new__(cls)
+        self.bits, self.hashes = bits, hashes
+        try:
+            # Память освобождает создатель, а не подключившиеся процессы
+            self.memory = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:  # Python < 3.13
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.owner = None
+        return self
+
+    def __reduce__(self):
+        return SharedBloomFilter.attach, (self.memory.name, self.bits, self.hashes)
+
+    def _positions(self, config):
+        """Номера бит по двойному хэшированию (Кирш — Митценмахер)"""
+        digest = hashlib.blake2b(config.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        bits = self.bits
+        return [(h1 + i * h2) % bits for i in range(self.hashes)]
+
+    def __contains__(self, config):
+        buf = self.memory.buf
+        return all(buf[p >> 3] >> (p & 7) & 1 for p in self._positions(config))
+
+    def add(self, config):
+        """Отмечает конфигурацию; возвращает True, если она уже была отмечена"""
+        buf = self.memory.buf
+        present = True
+        for p in self._positions(config):
+            byte, bit = p >> 3, 1 << (p & 7)
+            if not buf[byte] & bit:
+                buf[byte] |= bit
+                present = False
+        return present
+
+    def update(self, configs):
+        for config in configs:
+            self.add(config)
+
+    def close(self):
+        """Отключается от памяти; создатель также освобождает её"""
+        self.memory.close()
+        if self.owner == os.getpid():
+            self.memory.unlink()
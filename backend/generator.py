@@ -1,50 +1,89 @@
 import random
-import heapq
 import os
 import time
-from collections import defaultdict, deque
-from multiprocessing import Pool, Lock
+from collections import Counter
 import sys
-import io
-
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-
-# Конфигурация размеров поля
-FIELD_SIZES = {
-    '5x5': {
-        'width': 5, 'height': 5, 'red_row': 2,
-        'thresholds': {'EASY_MIN': 6, 'EASY_MAX': 10, 'MEDIUM_MIN': 11, 'MEDIUM_MAX': 15, 'HARD_MIN': 16}
-    },
-    '6x6': {
-        'width': 6, 'height': 6, 'red_row': 2,
-        'thresholds': {'EASY_MIN': 10, 'EASY_MAX': 14, 'MEDIUM_MIN': 15, 'MEDIUM_MAX': 20, 'HARD_MIN': 21}
-    },
-    '7x7': {
-        'width': 7, 'height': 7, 'red_row': 3,
-        'thresholds': {'EASY_MIN': 12, 'EASY_MAX': 16, 'MEDIUM_MIN': 17, 'MEDIUM_MAX': 22, 'HARD_MIN': 23}
-    }
-}
 
-RED_LENGTH = 2
+from rushhour import Board, FIELD_SIZES, RED_LENGTH, StateSpace, UNSOLVABLE, make_engine, prebuild_tables
+from rushhour import SolveCache, batch
+from rushhour import prefilter
+from rushhour.canonical import canonical
+from rushhour.prefilter import REJECT, UNKNOWN
+from rushhour.solvecache import DEFAULT_PATH as SOLVE_CACHE_PATH, MISS
+from rushhour.stats import SearchStats
+from levelstore import CHECKPOINT_LEVELS, LevelStore, known_configs, level_file
+import mutation
+from placement import Placements
+from tuning import KnobTuner, Knobs
+
+sys.stdout.reconfigure(encoding='utf-8')
+
 MAX_CARS = 21
+DIFFICULTIES = ('easy', 'medium', 'hard')
+STRATEGIES = ('sample', 'component', 'retrograde')
+# Сколько новых уровней каждой сложности добавляет один запуск
+LEVELS_PER_DIFFICULTY = 15
 MAX_ATTEMPTS = 5000000
 WALL_PROBABILITY = 0.15
+# Параметры расстановки без подстройки: стены только в трудных уровнях
+DEFAULT_KNOBS = {
+    'hard': Knobs(WALL_PROBABILITY, 0.7, 0.5, MAX_CARS),
+    None: Knobs(0.0, 0.6, 0.4, MAX_CARS),
+}
+
+# Число машин для обратного поиска: на плотных полях компоненты вырождены,
+# на слишком свободных — слишком велики для полного перебора
+RETROGRADE_CARS = {'5x5': (8, 10), '6x6': (12, 14), '7x7': (15, 18)}
+RETROGRADE_MAX_STATES = 200000
+# Отжиг начинается от кандидатов с длиной решения не меньше этой доли
+# нижней границы целевой сложности. Кандидаты у самой границы редки: при
+# доле 0.8 трудных уровней находится в разы меньше, чем при 0.45
+ANNEAL_START = 0.45
 
-file_lock = Lock()
+# Самые быстрые движки на уровнях каждого размера; на 5x5 пространство
+# состояний мало, и эвристика не окупает свою цену
+SIZE_ENGINES = {'5x5': 'bfs', '6x6': 'astar', '7x7': 'astar'}
+HEURISTIC_ENGINES = ('astar', 'ida')
+# Бюджет BFS-пробы prefilter: на 7x7 уровни, которые проба успевает решить,
+# A* с PDB решает не дороже, и проба только удваивает работу
+PROBE_STATES = {'5x5': 2000, '6x6': 2000, '7x7': 0}
 
 
 class RushHourGenerator:
-    def __init__(self, size):
+    def __init__(self, size, strategy='sample', per_component=None, heuristic='pdb', engine=None,
+                 stats=None, trace=False, batch_size=0, seen=None, solve_cache=None, prescreen=True,
+                 band_cutoff=True, tune=True, anneal=True):
+        """Генератор уровней одного размера.
+
+        strategy — способ получать кандидатов (STRATEGIES), engine и
+        heuristic — движок и эвристика решения. Остальные параметры
+        включают ступени отбора кандидатов; каждую описывает метод, который
+        её использует, а настройки из окружения — make_generator.
+        """
         self.size = size
+        self.heuristic = heuristic
+        self.engine = engine or SIZE_ENGINES[size]
+        self.stats = stats
+        self.trace = trace
+        self.batch_size = batch_size
+        self.solve_cache = solve_cache
+        self.prescreen = prescreen
+        self.band_cutoff = band_cutoff
+        self.tuner = KnobTuner(size) if tune and strategy == 'sample' else None
+        self.knobs = None
+        self.anneal = anneal
+        self.last_steps = None
+        self.open_difficulties = list(DIFFICULTIES)
+        self.outcomes = Counter()
+        self.strategy = strategy
+        self.per_component = per_component
         self.size_params = FIELD_SIZES[size]
         self.thresholds = self.size_params['thresholds']
-        self.easy_count = 0
-        self.medium_count = 0
-        self.hard_count = 0
-        self.seen_configs = set()
-        self.unsolvable_configs = set()
+        self.counts = dict.fromkeys(DIFFICULTIES, 0)
+        self.seen_configs = seen if seen is not None else set()
+        # Длины, найденные до классификации (компонента, пакет); читаются один раз
         self.cache = {}
-        self.total_generated = 0
+        self.attempts = 0
         self.start_time = time.time()
         self.load_existing_levels()
 
@@ -52,30 +91,33 @@ class RushHourGenerator:
         return self.thresholds
 
     def get_output_files(self):
-        return {
-            'easy': f"../frontend/src/levels/easy_{self.size}.js",
-            'medium': f"../frontend/src/levels/medium_{self.size}.js",
-            'hard': f"../frontend/src/levels/hard_{self.size}.js"
-        }
+        return {difficulty: level_file(self.size, difficulty) for difficulty in DIFFICULTIES}
 
     def load_existing_levels(self):
-        files = self.get_output_files()
-        for fname in files.values():
-            try:
-                with open(fname, 'r') as f:
-                    content = f.read()
-                    start = content.find('[') + 1
-                    end = content.find(']', start)
-                    levels_str = content[start:end]
-                    for line in levels_str.split('\n'):
-                        line = line.strip()
-                        if line.startswith('"') and line.endswith('"'):
-                            config = line[1:-1]
-                            self.seen_configs.add(config)
-            except FileNotFoundError:
-                continue
-
-    def generate_smart_config(self, difficulty=None):
+        self.seen_configs.update(canonical(config, self.size)
+                                 for config in known_configs(self.size, DIFFICULTIES))
+
+    def is_new(self, config):
+        """Отмечает конфигурацию виденной; False, если она уже встречалась.
+
+        Сравниваются канонические виды: уровни, отличающиеся буквами машин
+        или отражением, решаются один раз.
+        """
+        key = canonical(config, self.size)
+        if key in self.seen_configs:
+            return False
+        self.seen_configs.add(key)
+        return True
+
+    def generate_smart_config(self, difficulty=None, solved=False, car_limit=MAX_CARS, knobs=None):
+        """Случайно расставляет машины; при solved=True красная стоит у выхода.
+
+        knobs — параметры расстановки (tuning.Knobs), по умолчанию из
+        DEFAULT_KNOBS для сложности.
+        """
+        if knobs is None:
+            knobs = DEFAULT_KNOBS['hard' if difficulty == 'hard' else None]
+        car_limit = min(car_limit, knobs.car_limit)
         attempts = 0
         max_attempts = 1000
         width = self.size_params['width']
@@ -84,20 +126,22 @@ class RushHourGenerator:
 
         while attempts < max_attempts:
             attempts += 1
-            self.total_generated += 1
             field = ['o'] * (width * height)
 
-            if difficulty == 'hard':
+            if knobs.wall_probability:
                 for i in range(width * height):
-                    if random.random() < WALL_PROBABILITY:
+                    if random.random() < knobs.wall_probability:
                         if not (i // width == red_row and i % width >= RED_LENGTH):
                             field[i] = 'x'
 
-            red_x = random.choices(
-                range(width - RED_LENGTH),
-                weights=[(x + 1) * (width - x - RED_LENGTH) for x in range(width - RED_LENGTH)],
-                k=1
-            )[0]
+            if solved:
+                red_x = width - RED_LENGTH
+            else:
+                red_x = random.choices(
+                    range(width - RED_LENGTH),
+                    weights=[(x + 1) * (width - x - RED_LENGTH) for x in range(width - RED_LENGTH)],
+                    k=1
+                )[0]
             pos1 = red_row * width + red_x
             pos2 = pos1 + 1
             if field[pos1] != 'o' or field[pos2] != 'o':
@@ -105,81 +149,74 @@ class RushHourGenerator:
 
             field[pos1] = 'A'
             field[pos2] = 'A'
+            placements = Placements(self.size, field)
 
             cars_placed = 1
             car_chars = 'BCDEFGHIJKLMNOPQRSTUVWXYZ'[:MAX_CARS - 1]
 
             for c in car_chars:
-                if difficulty == 'hard':
-                    orientation = random.choices(['v', 'h'], weights=[7, 3], k=1)[0]
-                    length = random.choices([2, 3], weights=[5, 5], k=1)[0]
-                else:
-                    orientation = random.choices(['v', 'h'], weights=[6, 4], k=1)[0]
-                    length = random.choices([2, 3], weights=[6, 4], k=1)[0]
-
-                positions = self.find_valid_car_position(field, length, orientation)
+                if cars_placed >= car_limit:
+                    break
+                orientation = 'v' if random.random() < knobs.vertical_share else 'h'
+                length = 3 if random.random() < knobs.long_share else 2
+
+                positions = placements.sample(orientation, length)
                 if positions:
                     for p in positions:
                         field[p] = c
+                    placements.occupy(positions)
                     cars_placed += 1
 
             config = ''.join(field)
 
-            if (config not in self.seen_configs and
-                    config not in self.unsolvable_configs and
-                    cars_placed >= 6):
-                self.seen_configs.add(config)
+            if cars_placed >= 6 and self.is_new(config):
                 return config, attempts
 
         return None, attempts
 
-    def find_valid_car_position(self, field, length, orientation):
-        """Находит валидную позицию для машины"""
-        attempts = 0
-        max_attempts = 100
-        width = self.size_params['width']
-        height = self.size_params['height']
-        red_row = self.size_params['red_row']
-
-        while attempts < max_attempts:
-            attempts += 1
+    def solve_and_classify(self, config):
+        """Классифицирует уровень по сложности"""
+        if self.stats is None:
+            return self.classify(config)
 
-            if orientation == 'h':
-                x = random.randint(0, width - length)
-                y = random.randint(0, height - 1)
-                if y == red_row: continue
-                positions = [y * width + x + i for i in range(length)]
-            else:
-                x = random.randint(0, width - 1)
-                y = random.randint(0, height - length)
-                positions = [(y + i) * width + x for i in range(length)]
-
-            if all(field[p] == 'o' for p in positions):
-                if orientation == 'h' and y == red_row:
-                    red_pos = field.index('A')
-                    red_x = red_pos % width
-                    exit_path = range(red_x + RED_LENGTH, width)
-                    car_x_start = positions[0] % width
-                    car_x_end = positions[-1] % width
-                    if any(car_x_start <= x <= car_x_end for x in exit_path):
-                        continue
-                return positions
+        known = config in self.cache
+        result = self.classify(config)
+        self.outcomes['из кэша' if known else 'решено'] += 1
+        self.outcomes[result[0] if result else 'отброшено'] += 1
+        return result
 
-        return None
+    def classify(self, config):
+        self.last_steps = steps = self.measure(config)
+        return self.difficulty_for(steps)
 
-    def solve_and_classify(self, config):
-        """Классифицирует уровень по сложности"""
-        if config in self.unsolvable_configs:
-            return None
+    def measure(self, config):
+        """Длина решения: из кэшей, проверкой prefilter или решением.
 
+        None — решения нет или его длина заведомо вне открытых диапазонов.
+        """
+        # Повторно конфигурация сюда не попадёт: её не пропустит seen_configs
         if config in self.cache:
-            steps = self.cache[config]
-        else:
-            steps = self.solve_with_astar(config)
-            self.cache[config] = steps
+            return self.cache.pop(config)
+        # Попадание в кэш решений дешевле проверки prefilter
+        steps = self.cached_solve(config)
+        if steps is not MISS:
+            return steps
+        steps = self.screen_candidate(config)
+        if steps is UNKNOWN:
+            steps = self.search_level(config, max_depth=self.depth_limit())
+        return steps
+
+    def measure_mutant(self, config):
+        """Длина решения мутанта для отжига; None — мутант уже встречался"""
+        if not self.is_new(config):
+            return None
+        if self.stats is not None:
+            self.outcomes['мутантов'] += 1
+        return self.measure(config)
 
+    def difficulty_for(self, steps):
+        """(сложность, шаги) для длины решения или None, если она ни в какой диапазон не попала"""
         if steps is None:
-            self.unsolvable_configs.add(config)
             return None
 
         t = self.get_thresholds()
@@ -191,319 +228,295 @@ class RushHourGenerator:
             return ('hard', steps)
         return None
 
-    def solve_with_astar(self, config):
-        """Решает уровень с помощью A* с унифицированной эвристикой"""
-        grid = self.convert_to_grid(config)
-        cars = self.parse_grid(grid)
-        width = self.size_params['width']
-        height = self.size_params['height']
-        exit_row = self.size_params['red_row']
-        exit_col = width
-
-        open_set = []
-        heapq.heappush(open_set, (0, 0, grid, cars, []))
+    def open_bands(self):
+        """Диапазоны длин решений для сложностей, уровни которых ещё нужны"""
+        t = self.get_thresholds()
+        return [(t[f'{d.upper()}_MIN'], t.get(f'{d.upper()}_MAX')) for d in self.open_difficulties]
 
-        visited = set()
-        g_scores = {}
-        initial_key = self.get_state_key(grid)
-        g_scores[initial_key] = 0
+    def depth_limit(self):
+        """Наибольшая длина решения, которая ещё нужна.
 
-        while open_set:
-            _, g_score, current_grid, cars, path = heapq.heappop(open_set)
-            current_key = self.get_state_key(current_grid)
+        None — без ограничения: нужны трудные уровни или band_cutoff=False.
+        """
+        highs = [high for _, high in self.open_bands()]
+        if not self.band_cutoff or not highs or None in highs:
+            return None
+        return max(highs)
+
+    def screen_candidate(self, config):
+        """Дешёвая проверка rushhour.prefilter до решения.
+
+        Возвращает UNKNOWN, если нужен полный поиск, иначе длину решения;
+        None — решения нет или длина заведомо вне открытых диапазонов.
+        """
+        if not self.prescreen:
+            return UNKNOWN
+        verdict = prefilter.screen(Board(config, self.size), self.open_bands(), PROBE_STATES[self.size])
+        if verdict is UNKNOWN:
+            return UNKNOWN
+        if self.stats is not None:
+            self.outcomes['отсеяно проверкой'] += 1
+        return None if verdict is REJECT else verdict
+
+    def next_candidates(self, difficulty):
+        """Очередные конфигурации-кандидаты согласно стратегии генерации"""
+        if self.strategy == 'retrograde':
+            return self.generate_retrograde(difficulty)
+
+        config, _ = self.generate_smart_config(difficulty, knobs=self.knobs)
+        if not config:
+            return []
+
+        if self.strategy == 'component':
+            picked = self.pick_from_component(config, difficulty)
+            return [picked[0]] if picked else []
+
+        return [config]
+
+    def pick_from_component(self, config, difficulty):
+        """Выбирает в компоненте конфигурации состояние нужной сложности.
+
+        Перебирает все достижимые состояния, считает точные расстояния до
+        решения и возвращает (конфигурация, шаги): для hard — самое трудное
+        состояние, иначе — случайное из диапазона сложности.
+        """
+        board = Board(config, self.size)
+        try:
+            space = StateSpace(board)
+        except OverflowError:
+            return None
 
-            if current_key in visited:
+        t = self.get_thresholds()
+        if difficulty == 'hard':
+            hardest = space.hardest()
+            if not hardest:
+                return None
+            state, steps = hardest
+        else:
+            low, high = t[f'{difficulty.upper()}_MIN'], t[f'{difficulty.upper()}_MAX']
+            steps = random.randint(low, high)
+            candidates = space.states_at(steps)
+            if not candidates:
+                return None
+            state = random.choice(candidates)
+
+        picked = board.to_config(state)
+        if not self.is_new(picked):
+            return None
+        self.cache[picked] = steps
+        return picked, steps
+
+    def generate_retrograde(self, difficulty):
+        """Генерирует уровни обратным поиском от решённой позиции.
+
+        Расставляет машины с красной у выхода, перечисляет состояния,
+        достижимые из решённой позиции, и обратным BFS от всех целевых
+        состояний среди них получает точные длины решений: любой путь из
+        такого состояния не выходит за перечисленное множество. Возвращает
+        все новые конфигурации с длиной не меньше нижней границы сложности
+        (не больше per_component, если он задан), начиная с самых трудных;
+        их длины кладутся в кэш, и заново они не решаются.
+        """
+        solved, _ = self.generate_smart_config(
+            None, solved=True, car_limit=random.randint(*RETROGRADE_CARS[self.size]))
+        if not solved:
+            return []
+
+        board = Board(solved, self.size)
+        try:
+            space = StateSpace(board, max_states=RETROGRADE_MAX_STATES)
+        except OverflowError:
+            return []
+
+        low = self.get_thresholds()[f'{difficulty.upper()}_MIN']
+        order = sorted(range(len(space)), key=space.distances.__getitem__, reverse=True)
+        levels = []
+        for i in order:
+            steps = space.distances[i]
+            if steps == UNSOLVABLE:
                 continue
-            visited.add(current_key)
-
-            if self.is_solved(cars):
-                return len(path)
-
-            for move in self.get_possible_moves(current_grid, cars, width, height, exit_row):
-                new_grid, new_cars = self.apply_move(current_grid, cars, move, width, height)
-                new_key = self.get_state_key(new_grid)
-
-                new_g = g_score + 1
-                if new_key not in g_scores or new_g < g_scores[new_key]:
-                    g_scores[new_key] = new_g
-                    h = self.heuristic(new_grid, new_cars, exit_row, exit_col)
-                    f = new_g + h
-                    heapq.heappush(open_set, (f, new_g, new_grid, new_cars, path + [move]))
-
-        return None
-
-    def convert_to_grid(self, config):
-        """Конвертирует строку уровня в сетку"""
-        width = self.size_params['width']
-        height = self.size_params['height']
-        red_row = self.size_params['red_row']
-        
-        grid = [[0 for _ in range(width + 1)] for _ in range(height)]
-        char_to_id = {'A': 1}
-        next_id = 2
-
-        for i, c in enumerate(config):
-            row, col = divmod(i, width)
-            if c == 'o':
-                grid[row][col] = 0
-            elif c == 'x':
-                grid[row][col] = -1
-            else:
-                if c not in char_to_id:
-                    char_to_id[c] = next_id
-                    next_id += 1
-                grid[row][col] = char_to_id[c]
-
-        grid[red_row][width] = 99
-        return grid
-
-    def parse_grid(self, grid):
-        """Парсит сетку в список машин"""
-        width = self.size_params['width']
-        height = self.size_params['height']
-        cars = []
-        car_ids = set()
-
-        for row in range(height):
-            for col in range(width):
-                cell = grid[row][col]
-                if cell > 0 and cell != 99:
-                    car_ids.add(cell)
-
-        for car_id in car_ids:
-            positions = []
-            for row in range(height):
-                for col in range(width):
-                    if grid[row][col] == car_id:
-                        positions.append((row, col))
-
-            if len(positions) < 2:
+            if steps < low or self.per_component and len(levels) >= self.per_component:
+                break
+            config = board.to_config(space.states[i])
+            if self.is_new(config):
+                self.cache[config] = steps
+                levels.append(config)
+
+        return levels
+
+    def solve_batch(self, configs):
+        """Решает пакетом ещё не решённые конфигурации и кладёт длины в кэш"""
+        pending = []
+        for config in dict.fromkeys(configs):
+            if config in self.cache:
                 continue
-
-            positions.sort()
-            if positions[0][0] == positions[1][0]:
-                orientation = 'h'
-                length = positions[-1][1] - positions[0][1] + 1
+            steps = self.cached_solve(config)
+            if steps is MISS:
+                steps = self.screen_candidate(config)
+            if steps is UNKNOWN:
+                pending.append(config)
             else:
-                orientation = 'v'
-                length = positions[-1][0] - positions[0][0] + 1
-
-            cars.append({
-                'id': car_id,
-                'orientation': orientation,
-                'length': length,
-                'row': positions[0][0],
-                'col': positions[0][1]
-            })
-
-        return cars
-
-    def get_state_key(self, grid):
-        """Создает ключ состояния сетки"""
-        width = self.size_params['width']
-        return tuple(tuple(row[:width]) for row in grid)
-
-    def is_solved(self, cars):
-        """Проверяет, решен ли уровень"""
-        width = self.size_params['width']
-        red_row = self.size_params['red_row']
-        
-        for car in cars:
-            if car['id'] == 1:
-                return (car['orientation'] == 'h' and
-                        car['row'] == red_row and
-                        car['col'] + car['length'] == width)
-        return False
-
-    def heuristic(self, grid, cars, exit_row, exit_col):
-        """Унифицированная эвристика: количество машин на пути"""
-        red_car = next((car for car in cars if car['id'] == 1), None)
-        if not red_car:
-            return float('inf')
-
-        if red_car['orientation'] != 'h' or red_car['row'] != exit_row:
-            return float('inf')
-
-        blocking = 0
-        exit_col_red = red_car['col'] + red_car['length']
-        
-        for col in range(exit_col_red, exit_col):
-            if grid[exit_row][col] != 0 and grid[exit_row][col] != 99:
-                blocking += 1
-
-        return blocking
-
-    def get_possible_moves(self, grid, cars, width, height, exit_row):
-        """Генерирует все возможные ходы"""
-        moves = []
-        
-        for i, car in enumerate(cars):
-            if car['orientation'] == 'h':
-                # Движение влево
-                left_move = 0
-                for dist in range(1, car['col'] + 1):
-                    if grid[car['row']][car['col'] - dist] == 0:
-                        left_move = dist
-                    else:
-                        break
-                if left_move > 0:
-                    moves.append((i, 'left', left_move))
-
-                # Движение вправо
-                right_move = 0
-                for dist in range(1, (width - (car['col'] + car['length'])) + 1):
-                    new_col = car['col'] + car['length'] - 1 + dist
-                    if new_col < width:
-                        if grid[car['row']][new_col] == 0:
-                            right_move = dist
-                        else:
-                            break
-                    elif new_col == width and car['id'] == 1:
-                        right_move = dist
-                        break
-                if right_move > 0:
-                    moves.append((i, 'right', right_move))
-            else:
-                # Движение вверх
-                up_move = 0
-                for dist in range(1, car['row'] + 1):
-                    if grid[car['row'] - dist][car['col']] == 0:
-                        up_move = dist
-                    else:
-                        break
-                if up_move > 0:
-                    moves.append((i, 'up', up_move))
-
-                # Движение вниз
-                down_move = 0
-                for dist in range(1, (height - (car['row'] + car['length'])) + 1):
-                    if grid[car['row'] + car['length'] - 1 + dist][car['col']] == 0:
-                        down_move = dist
-                    else:
-                        break
-                if down_move > 0:
-                    moves.append((i, 'down', down_move))
-
-        return moves
-
-    def apply_move(self, grid, cars, move, width, height):
-        """Применяет ход к сетке"""
-        car_idx, direction, distance = move
-        car = cars[car_idx]
-        new_grid = [row.copy() for row in grid]
-        new_cars = [c.copy() for c in cars]
-
-        # Очищаем старую позицию
-        for i in range(car['length']):
-            if car['orientation'] == 'h':
-                new_grid[car['row']][car['col'] + i] = 0
-            else:
-                new_grid[car['row'] + i][car['col']] = 0
-
-        # Обновляем позицию
-        if direction == 'left':
-            new_cars[car_idx]['col'] -= distance
-        elif direction == 'right':
-            new_cars[car_idx]['col'] += distance
-        elif direction == 'up':
-            new_cars[car_idx]['row'] -= distance
-        elif direction == 'down':
-            new_cars[car_idx]['row'] += distance
-
-        # Заполняем новую позицию
-        for i in range(new_cars[car_idx]['length']):
-            if new_cars[car_idx]['orientation'] == 'h':
-                col = new_cars[car_idx]['col'] + i
-                if col < width:
-                    new_grid[new_cars[car_idx]['row']][col] = car['id']
-            else:
-                row = new_cars[car_idx]['row'] + i
-                new_grid[row][new_cars[car_idx]['col']] = car['id']
-
-        return new_grid, new_cars
-
-    def save_config(self, config, difficulty, steps):
-        """Сохраняет конфигурацию в файл"""
-        filename = f"../frontend/src/levels/{difficulty}_{self.size}.js"
-        
-        with file_lock:
-            try:
-                with open(filename, 'r') as f:
-                    content = f.read().strip()
-            except FileNotFoundError:
-                content = f"export const {difficulty.capitalize()}Levels = [\n]"
-
-            if "export const" not in content:
-                content = f"export const {difficulty.capitalize()}Levels = [\n]"
-
-            if content.endswith("]"):
-                content = content[:-1]
-            
-            if not content.endswith("[\n"):
-                content += ",\n"
-            content += f'"{config}"\n]'
-
-            with open(filename, 'w') as f:
-                f.write(content)
-
-    def run(self):
-        print(f"Старт генерации {self.size}...", flush=True)
-        attempt_id = 0  # <- глобальный счётчик попыток генерации
-
-        while (self.easy_count < 15 or self.medium_count < 15 or self.hard_count < 15):
-            attempt_id += 1  # Увеличиваем каждый раз, когда пробуем сгенерировать
-            if self.hard_count < 15:
-                difficulty_target = 'hard'
-            elif self.medium_count < 15:
-                difficulty_target = 'medium'
-            else:
-                difficulty_target = 'easy'
-
-            config, _ = self.generate_smart_config(difficulty_target)
-            if not config:
-                continue
-
+                self.cache[config] = steps
+        if not pending:
+            return
+        max_depth = self.depth_limit()
+        found = batch.solve_batch(pending, self.size, self.batch_size, max_depth, stats=self.stats)
+        for config, steps in zip(pending, found):
+            self.cache[config] = steps
+        if self.solve_cache is not None:
+            results = zip(pending, found)
+            if max_depth is not None:
+                # None при ограничении глубины может значить «длиннее max_depth»
+                results = [(config, steps) for config, steps in results if steps is not None]
+            self.solve_cache.put_many(results)
+        if self.stats is not None:
+            self.outcomes['решено пакетом'] += len(pending)
+
+    def cached_solve(self, config, want_path=False):
+        """Результат из постоянного кэша решений или MISS"""
+        if self.solve_cache is None:
+            return MISS
+        result = self.solve_cache.lookup(config, want_path=want_path)
+        if result is not MISS and self.stats is not None:
+            self.outcomes['из кэша решений'] += 1
+        return result
+
+    def search_level(self, config, want_path=False, max_depth=None):
+        """Решает уровень движком, выбранным для размера поля, минуя кэш решений.
+
+        Возвращает длину решения, а при want_path=True — список ходов.
+        max_depth — предел длины: решения длиннее него не ищутся, результат
+        тогда None. Точный результат записывается в кэш решений.
+        """
+        board = Board(config, self.size)
+        options = {'heuristic': self.heuristic} if self.engine in HEURISTIC_ENGINES else {}
+        options['max_depth'] = max_depth
+        if self.stats is not None:
+            options['stats'] = SearchStats(self.stats.sample_every)
+        engine = make_engine(self.engine, board, **options)
+        result = engine.search(want_path)
+        if engine.cut_off and self.stats is not None:
+            self.outcomes['оборвано по сложности'] += 1
+        if self.solve_cache is not None and not engine.cut_off:
+            self.solve_cache.record(config, result, want_path=want_path, nodes=engine.nodes_expanded)
+
+        if self.stats is not None:
+            self.stats.merge(engine.stats)
+            if self.trace:
+                print(f"{self.size} {config}: {engine.stats}", flush=True)
+        return result
+
+    def produce(self, difficulty_target):
+        """Одна попытка (при пакетном решении — пакет попыток) под нужную сложность.
+
+        Возвращает классифицированные кандидаты: список (конфигурация,
+        сложность, шаги); сложность может отличаться от целевой.
+        """
+        if self.tuner is not None:
+            self.knobs = self.tuner.choose(self.open_difficulties)
+            start = time.process_time()
+        self.attempts += 1
+        candidates = list(self.next_candidates(difficulty_target))
+        if self.batch_size:
+            for _ in range(self.batch_size - 1):
+                self.attempts += 1
+                candidates.extend(self.next_candidates(difficulty_target))
+            self.solve_batch(candidates)
+
+        goal = self.get_thresholds()[f'{difficulty_target.upper()}_MIN']
+        found = []
+        for config in candidates:
             result = self.solve_and_classify(config)
-            if not result:
-                continue
-
-            difficulty, steps = result
-
-            if difficulty == 'easy' and self.easy_count >= 15:
-                continue
-            elif difficulty == 'medium' and self.medium_count >= 15:
-                continue
-            elif difficulty == 'hard' and self.hard_count >= 15:
+            if result:
+                found.append((config,) + result)
+            if result and result[0] in self.open_difficulties or not self.should_anneal(goal):
                 continue
+            climbed = mutation.anneal(config, self.last_steps, self.size, self.measure_mutant, goal)
+            result = climbed and self.difficulty_for(climbed[1])
+            if result:
+                found.append((climbed[0],) + result)
+        if self.tuner is not None:
+            hits = sum(difficulty in self.open_difficulties for _, difficulty, _ in found)
+            self.tuner.update(self.open_difficulties, self.knobs, hits, time.process_time() - start)
+        return found
+
+    def should_anneal(self, goal):
+        """Стоит ли доводить отжигом последний кандидат, не попавший в открытые диапазоны"""
+        steps = self.last_steps
+        return self.anneal and steps is not None and ANNEAL_START * goal <= steps < goal
 
-            self.save_config(config, difficulty, steps)
-
-            if difficulty == 'easy':
-                self.easy_count += 1
-            elif difficulty == 'medium':
-                self.medium_count += 1
-            else:
-                self.hard_count += 1
-
-            print(
-                f"{self.size}: {difficulty.upper()} ({steps} шагов, найден на попытке #{attempt_id}) | "
-                f"Easy: {self.easy_count}/15, Medium: {self.medium_count}/15, Hard: {self.hard_count}/15",
-                flush=True
-            )
-
-
-
-def generate_for_size(size):
-    generator = RushHourGenerator(size)
-    generator.run()
+    def run(self):
+        """Генерация в одном процессе; уровни пишутся через LevelStore"""
+        print(f"Старт генерации {self.size}...", flush=True)
+        store = LevelStore()
+        try:
+            self._run(store)
+        finally:
+            store.close()
+
+    def _run(self, store):
+        counts = self.counts
+
+        while min(counts.values()) < LEVELS_PER_DIFFICULTY:
+            self.open_difficulties = [d for d in DIFFICULTIES if counts[d] < LEVELS_PER_DIFFICULTY]
+            # Сначала самые трудные уровни
+            difficulty_target = self.open_difficulties[-1]
+
+            for config, difficulty, steps in self.produce(difficulty_target):
+                if counts[difficulty] >= LEVELS_PER_DIFFICULTY:
+                    continue
+
+                store.append(self.size, difficulty, config, steps)
+                counts[difficulty] += 1
+                if sum(counts.values()) % CHECKPOINT_LEVELS == 0:
+                    store.export()
+
+                print(
+                    f"{self.size}: {difficulty.upper()} ({steps} шагов, найден на попытке #{self.attempts}) | "
+                    f"Easy: {counts['easy']}/{LEVELS_PER_DIFFICULTY}, "
+                    f"Medium: {counts['medium']}/{LEVELS_PER_DIFFICULTY}, "
+                    f"Hard: {counts['hard']}/{LEVELS_PER_DIFFICULTY}",
+                    flush=True
+                )
+                if self.stats is not None:
+                    self.print_stats()
+
+    def print_stats(self):
+        outcomes = ', '.join(f"{name} {count}" for name, count in self.outcomes.most_common())
+        print(f"{self.size} статистика: {self.stats} | {outcomes}", flush=True)
+
+
+def make_generator(size, seen=None):
+    """Генератор с настройками из окружения.
+
+    RUSHHOUR_STATS=N включает статистику решений с замером каждого N-го
+    вызова (0 — только счётчики), RUSHHOUR_TRACE=1 — печать по каждому решению,
+    RUSHHOUR_BATCH=N — решение кандидатов пакетами по N на NumPy,
+    RUSHHOUR_CACHE=путь — файл кэша решений (пустое значение выключает кэш),
+    RUSHHOUR_STRATEGY — стратегия генерации из STRATEGIES (по умолчанию 'sample'),
+    RUSHHOUR_PER_COMPONENT=N — не больше N уровней из одной компоненты при
+    strategy='retrograde' (по умолчанию все достаточно трудные).
+    seen передаётся в RushHourGenerator.
+    """
+    strategy = os.environ.get('RUSHHOUR_STRATEGY') or 'sample'
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Неизвестная стратегия генерации: {strategy}")
+    per_component = int(os.environ.get('RUSHHOUR_PER_COMPONENT') or 0) or None
+    prebuild_tables()
+    batch_size = int(os.environ.get('RUSHHOUR_BATCH') or 0)
+    if batch_size and not batch.available():
+        print(f"{size}: NumPy не установлен, кандидаты решаются по одному", flush=True)
+        batch_size = 0
+    cache_path = os.environ.get('RUSHHOUR_CACHE', SOLVE_CACHE_PATH)
+    solve_cache = SolveCache(cache_path) if cache_path else None
+    sample_every = os.environ.get('RUSHHOUR_STATS')
+    stats = SearchStats(int(sample_every or 0)) if sample_every is not None else None
+    return RushHourGenerator(size, strategy, per_component, stats=stats,
+                             trace=bool(os.environ.get('RUSHHOUR_TRACE')),
+                             batch_size=batch_size, seen=seen, solve_cache=solve_cache)
 
 
 if __name__ == "__main__":
-    print("Запуск параллельной генерации...", flush=True)
-    start_time = time.time()
-
-    with Pool(processes=3) as pool:
-        pool.map(generate_for_size, ['5x5', '6x6', '7x7'])
-
-    total_time = time.time() - start_time
-    print(f"Все уровни сгенерированы за {total_time:.1f} секунд", flush=True)
\ No newline at end of file
+    # Параллельная генерация всех размеров — в scheduler.py
+    from scheduler import main
+    main()
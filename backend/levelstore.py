@@ -0,0 +1,104 @@
+"""Хранилище найденных уровней.
+
+Найденный уровень не вписывается в .js сразу: он дописывается строкой JSON
+в журнал (append и fsync — постоянная работа на уровень), а файлы
+frontend/src/levels/{сложность}_{размер}.js пересобираются из журнала
+одним проходом на контрольной точке и в конце генерации. Журнал пишет
+один процесс; в параллельной генерации это координатор, а рабочие
+передают ему уровни через очередь.
+
+Если генерация прервалась, журнал сохраняет найденные с последней
+выгрузки уровни, и следующая выгрузка их добавит: уровни, уже
+записанные в .js, повторно не добавляются.
+"""
+import json
+import os
+import re
+
+LEVELS_DIR = "../frontend/src/levels"
+JOURNAL_PATH = "generated_levels.jsonl"
+# Через сколько найденных уровней пересобирать .js-файлы
+CHECKPOINT_LEVELS = 10
+
+
+def level_file(size, difficulty, levels_dir=LEVELS_DIR):
+    return os.path.join(levels_dir, f"{difficulty}_{size}.js")
+
+
+def read_level_file(path):
+    """Имя экспорта и список уровней .js-файла; (None, []), если файла нет"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except FileNotFoundError:
+        return None, []
+    name = re.search(r'export const (\w+)', content)
+    return (name.group(1) if name else None), re.findall(r'"([^"]+)"', content)
+
+
+def write_level_file(path, name, configs):
+    """Атомарно перезаписывает .js-файл в прежнем формате"""
+    body = '\n,\n'.join(f'"{config}"' for config in configs)
+    content = f"export const {name} = [\n{body}\n]" if configs else f"export const {name} = [\n]"
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp, path)
+
+
+def read_journal(path=JOURNAL_PATH):
+    """Записи журнала; неполная последняя строка после сбоя пропускается"""
+    records = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def known_configs(size, difficulties, levels_dir=LEVELS_DIR, journal=JOURNAL_PATH):
+    """Уровни размера size из .js-файлов и ещё не выгруженные из журнала"""
+    configs = set()
+    for difficulty in difficulties:
+        configs.update(read_level_file(level_file(size, difficulty, levels_dir))[1])
+    configs.update(r['config'] for r in read_journal(journal) if r['size'] == size)
+    return configs
+
+
+class LevelStore:
+    def __init__(self, journal=JOURNAL_PATH, levels_dir=LEVELS_DIR):
+        self.journal = journal
+        self.levels_dir = levels_dir
+        self.file = open(journal, 'a', encoding='utf-8')
+
+    def append(self, size, difficulty, config, steps):
+        """Дописывает уровень в журнал; после возврата запись на диске"""
+        record = {'size': size, 'difficulty': difficulty, 'config': config, 'steps': steps}
+        self.file.write(json.dumps(record) + '\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def export(self):
+        """Пересобирает .js-файлы, в которые журнал добавляет уровни"""
+        grouped = {}
+        for record in read_journal(self.journal):
+            grouped.setdefault((record['size'], record['difficulty']), []).append(record['config'])
+
+        for (size, difficulty), configs in grouped.items():
+            path = level_file(size, difficulty, self.levels_dir)
+            name, existing = read_level_file(path)
+            present = set(existing)
+            added = [config for config in dict.fromkeys(configs) if config not in present]
+            if added:
+                write_level_file(path, name or f"{difficulty}Levels_{size}", existing + added)
+
+    def close(self):
+        """Последняя выгрузка; журнал очищается, раз всё уже в .js"""
+        self.export()
+        self.file.truncate(0)
+        self.file.close()
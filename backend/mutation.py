@@ -0,0 +1,159 @@
+"""Локальный поиск от уровней, немного не дотянувших до нужной сложности.
+
+mutate() делает из уровня соседний: добавляет, убирает, переставляет на
+другое место или сдвигает поперёк хода машину, ставит или убирает стену.
+anneal() — отжиг по длине решения: мутант принимается, если решается не
+короче текущего уровня, а более короткий — с вероятностью
+exp(-разница / температура); температура падает с каждым шагом. Поиск
+заканчивается на первом мутанте с длиной не меньше goal или бросается,
+если лучшая длина долго не растёт.
+
+Каждый мутант решается заново: мутация меняет граф состояний, и
+прежний поиск для него не годится. Дешёвым повторное решение делают
+проверка rushhour.prefilter, обрыв по открытым диапазонам и кэш
+решений генератора.
+"""
+import math
+import random
+
+from placement import Placements
+from rushhour import FIELD_SIZES, RED_LENGTH
+from rushhour.canonical import LETTERS, relabel
+
+MIN_CARS = 6
+MAX_CARS = 21
+ANNEAL_STEPS = 400
+# Отжиг бросается, если лучшая длина не росла столько мутаций подряд
+PATIENCE = 60
+START_TEMPERATURE = 2.0
+COOLING = 0.98
+KINDS = [(orientation, length) for orientation in 'vh' for length in (2, 3)]
+
+
+def mutate(config, size):
+    """Случайный соседний уровень или None, если ни одна мутация не применима"""
+    params = FIELD_SIZES[size]
+    width, red_row = params['width'], params['red_row']
+    field = list(config)
+    cars = {}
+    for i, c in enumerate(field):
+        if c not in 'oxA':
+            cars.setdefault(c, []).append(i)
+
+    # Стены не ставятся на пути красной машины к выходу, как в generate_smart_config
+    free = [i for i, c in enumerate(field)
+            if c == 'o' and not (i // width == red_row and i % width >= RED_LENGTH)]
+    walls = [i for i, c in enumerate(field) if c == 'x']
+    moves = []
+    if len(cars) + 1 < MAX_CARS:
+        moves.append(add_car)
+    if len(cars) + 1 > MIN_CARS:
+        moves.append(remove_car)
+    if cars:
+        moves.extend((move_car, shift_car))
+    if free:
+        moves.append(add_wall)
+    if walls:
+        moves.append(remove_wall)
+
+    random.shuffle(moves)
+    for move in moves:
+        if move(field, size, cars, free, walls):
+            return relabel(''.join(field))
+    return None
+
+
+def add_car(field, size, cars, free, walls):
+    positions = Placements(size, field).sample(*random.choice(KINDS))
+    if not positions:
+        return False
+    letter = next(c for c in LETTERS if c not in cars)
+    for p in positions:
+        field[p] = letter
+    return True
+
+
+def remove_car(field, size, cars, free, walls):
+    for p in cars[random.choice(list(cars))]:
+        field[p] = 'o'
+    return True
+
+
+def move_car(field, size, cars, free, walls):
+    """Переставляет машину на случайное свободное место любого вида"""
+    letter = random.choice(list(cars))
+    cells = cars[letter]
+    for p in cells:
+        field[p] = 'o'
+    placements = Placements(size, field)
+    positions = None
+    for orientation, length in random.sample(KINDS, len(KINDS)):
+        positions = placements.sample(orientation, length)
+        if positions:
+            break
+    for p in positions or cells:
+        field[p] = letter
+    return positions is not None
+
+
+def shift_car(field, size, cars, free, walls):
+    """Сдвигает машину на ряд поперёк её хода"""
+    params = FIELD_SIZES[size]
+    width, height, red_row = params['width'], params['height'], params['red_row']
+    letter = random.choice(list(cars))
+    cells = cars[letter]
+    horizontal = cells[1] - cells[0] == 1
+    step = random.choice((-1, 1)) * (width if horizontal else 1)
+    moved = [p + step for p in cells]
+    for p in moved:
+        if not 0 <= p < width * height or field[p] not in ('o', letter):
+            return False
+    if horizontal and moved[0] // width == red_row:
+        return False
+    if not horizontal and moved[0] // width != cells[0] // width:
+        return False  # Ушла за край строки
+    for p in cells:
+        field[p] = 'o'
+    for p in moved:
+        field[p] = letter
+    return True
+
+
+def add_wall(field, size, cars, free, walls):
+    field[random.choice(free)] = 'x'
+    return True
+
+
+def remove_wall(field, size, cars, free, walls):
+    field[random.choice(walls)] = 'o'
+    return True
+
+
+def anneal(config, steps, size, measure, goal, max_steps=ANNEAL_STEPS, patience=PATIENCE):
+    """Отжиг от config с длиной решения steps до длины не меньше goal.
+
+    measure(config) — длина решения мутанта или None (решения нет, уровень
+    уже встречался или заведомо не нужен). Возвращает (уровень, длина)
+    или None, если за max_steps мутаций цель не достигнута.
+    """
+    temperature = START_TEMPERATURE
+    best, stale = steps, 0
+    for _ in range(max_steps):
+        mutant = mutate(config, size)
+        if mutant is None:
+            return None
+        mutant_steps = measure(mutant)
+        temperature *= COOLING
+        if mutant_steps is None:
+            continue
+        if mutant_steps >= goal:
+            return mutant, mutant_steps
+        if mutant_steps > best:
+            best, stale = mutant_steps, 0
+        else:
+            stale += 1
+            if stale >= patience:
+                return None
+        if mutant_steps >= steps or random.random() < math.exp((mutant_steps - steps) / temperature):
+            config, steps = mutant, mutant_steps
+    return None
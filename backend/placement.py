@@ -0,0 +1,86 @@
+"""Случайная расстановка машин без повторных попыток.
+
+Для каждого размера поля заранее перечисляются все места машины —
+ориентация, длина и занятые клетки — и для каждой клетки места, которые
+её задевают. Placements хранит свободные места каждого вида в списке с
+индексом: выбор случайного места и удаление занятого — O(1), а
+постановка машины удаляет только места, задевающие её клетки. Поэтому
+расстановка стоит столько, сколько машин ставится, а не сколько
+случайных мест отвергнуто.
+
+Горизонтальные машины не ставятся в строку красной машины.
+"""
+import random
+from functools import lru_cache
+
+from rushhour import FIELD_SIZES
+
+LENGTHS = (2, 3)
+
+
+@lru_cache(maxsize=None)
+def placement_table(size):
+    """Места машин поля, номера мест, задевающих каждую клетку, и номера
+    мест по виду (ориентация, длина) с позициями номеров в этих списках.
+
+    Место — тройка (ориентация, длина, клетки); ориентация 'h' или 'v'.
+    """
+    params = FIELD_SIZES[size]
+    width, height, red_row = params['width'], params['height'], params['red_row']
+    places = []
+    for length in LENGTHS:
+        for y in range(height):
+            if y == red_row:
+                continue
+            for x in range(width - length + 1):
+                places.append(('h', length, tuple(y * width + x + i for i in range(length))))
+        for x in range(width):
+            for y in range(height - length + 1):
+                places.append(('v', length, tuple((y + i) * width + x for i in range(length))))
+
+    covering = [[] for _ in range(width * height)]
+    for place, (_, _, cells) in enumerate(places):
+        for cell in cells:
+            covering[cell].append(place)
+
+    free = {}
+    index = {}
+    for place, (orientation, length, _) in enumerate(places):
+        kind = free.setdefault((orientation, length), [])
+        index[place] = len(kind)
+        kind.append(place)
+    return tuple(places), tuple(map(tuple, covering)), free, index
+
+
+class Placements:
+    def __init__(self, size, field=None):
+        """Свободные места пустого поля; field — уже занятые клетки (не 'o')"""
+        self.places, self.covering, free, index = placement_table(size)
+        # Номера свободных мест по виду (ориентация, длина) и позиция номера в списке
+        self.free = {kind: places.copy() for kind, places in free.items()}
+        self.index = index.copy()
+        if field is not None:
+            self.occupy(i for i, c in enumerate(field) if c != 'o')
+
+    def sample(self, orientation, length):
+        """Клетки случайного свободного места или None, если мест нет"""
+        free = self.free[(orientation, length)]
+        if not free:
+            return None
+        return self.places[random.choice(free)][2]
+
+    def occupy(self, cells):
+        """Убирает места, задевающие занятые клетки"""
+        for cell in cells:
+            for place in self.covering[cell]:
+                if place in self.index:
+                    self.remove(place)
+
+    def remove(self, place):
+        orientation, length, _ = self.places[place]
+        free = self.free[(orientation, length)]
+        i = self.index.pop(place)
+        last = free.pop()
+        if last != place:
+            free[i] = last
+            self.index[last] = i
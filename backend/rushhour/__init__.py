@@ -0,0 +1,15 @@
+from .config import FIELD_SIZES, RED_LENGTH, size_for_config
+from .board import Board, POS_BITS, POS_MASK
+from .moves import slide_table, reverse_slide_table, prebuild_tables
+from .paths import reconstruct_path
+from .statespace import StateSpace, UNSOLVABLE
+from .solver import ENGINES, make_engine, solve
+from .solvecache import SolveCache
+
+__all__ = [
+    'FIELD_SIZES', 'RED_LENGTH', 'size_for_config',
+    'Board', 'POS_BITS', 'POS_MASK',
+    'slide_table', 'reverse_slide_table', 'prebuild_tables',
+    'reconstruct_path', 'StateSpace', 'UNSOLVABLE',
+    'ENGINES', 'make_engine', 'solve', 'SolveCache',
+]
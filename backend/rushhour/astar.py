@@ -0,0 +1,73 @@
+"""A* с допустимой эвристикой из rushhour.heuristics."""
+import heapq
+
+from .engine import Engine
+from .heuristics import INF, make_heuristic
+from .paths import reconstruct_path
+
+
+class AStar(Engine):
+    def __init__(self, board, heuristic='pdb', stats=None, max_depth=None):
+        super().__init__(board, stats, max_depth)
+        self.estimate = make_heuristic(heuristic, board)
+        if stats is not None:
+            self.estimate = stats.timed('heuristic', self.estimate)
+
+    def run(self, want_path=True):
+        """Путь восстанавливается по указателям на родителя только в конце.
+
+        Эвристика может быть несогласованной, поэтому состояние раскрывается
+        повторно, если к нему нашёлся более короткий путь. Эвристика
+        допустима, поэтому состояния с f больше max_depth в очередь не
+        попадают: решения не длиннее max_depth через них нет.
+        """
+        board = self.board
+        stats = self.stats
+        estimate = self.estimate
+        limit = INF if self.max_depth is None else self.max_depth
+        start = board.initial_state
+        if estimate(start) == INF:
+            return None
+        if estimate(start) > limit:
+            self.cut_off = True
+            return None
+
+        open_set = [(estimate(start), 0, start)]
+        g_scores = {start: 0}
+        parents = {start: None} if want_path else None
+        pruned = False
+
+        while open_set:
+            _, g_score, state = heapq.heappop(open_set)
+            g_score = -g_score
+
+            if g_score > g_scores[state]:
+                continue  # Устаревшая запись в очереди
+            self.nodes_expanded += 1
+
+            if board.is_solved(state):
+                self.states_stored = len(g_scores)
+                return reconstruct_path(parents, state) if want_path else g_score
+
+            new_g = g_score + 1
+            successors = self.successors(state)
+            if stats is not None:
+                stats.expand(len(successors), len(open_set))
+
+            for move, new_state in successors:
+                if new_state not in g_scores or new_g < g_scores[new_state]:
+                    h = estimate(new_state)
+                    if h == INF:
+                        continue
+                    g_scores[new_state] = new_g
+                    if new_g + h > limit:
+                        pruned = True
+                        continue
+                    if want_path:
+                        parents[new_state] = (state, move)
+                    # При равном f раньше раскрываются более глубокие состояния
+                    heapq.heappush(open_set, (new_g + h, -new_g, new_state))
+
+        self.states_stored = len(g_scores)
+        self.cut_off = pruned
+        return None
@@ -0,0 +1,250 @@
+"""Пакетный BFS: много уровней одного размера за один проход на NumPy.
+
+Фронты всех уровней пакета лежат в двух параллельных массивах: номера
+уровней и упакованные состояния Board (uint64 вмещает все 21 машину).
+Машины уровней дополняются до общего числа пустыми местами без ходов,
+поэтому в пакет попадают уровни с любым числом машин. Слой раскрывается
+целиком: маски занятости собираются из массивов масок машин, ходы берутся
+из таблиц сдвигов, переведённых в массивы. Повторы среди потомков
+отсекаются сортировкой пар (уровень, состояние) через np.lexsort, а уже
+посещённые — двоичным поиском по отсортированным посещённым парам. Ходы — сдвиг до упора, как в генераторе, поэтому длины
+совпадают с BFS и A*.
+
+NumPy — необязательная зависимость: он импортируется при создании
+BatchBFS, а available() позволяет проверить его наличие заранее.
+"""
+import time
+from functools import lru_cache
+
+from .board import Board, POS_BITS, POS_MASK
+from .config import FIELD_SIZES
+from .moves import CAR_LENGTHS, slide_table
+
+DEFAULT_BATCH_SIZE = 1024
+
+
+def available():
+    """Установлен ли NumPy"""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("Для пакетного решения нужен NumPy: pip install numpy") from e
+    return numpy
+
+
+@lru_cache(maxsize=None)
+def _slide_arrays(width, height):
+    """Массивы back и ahead [горизонтальна, длина машины, позиция, маска полосы].
+
+    Значение — расстояние сдвига до упора назад и вперёд, 0 — хода нет.
+    Для длины 0 (пустые места пакета под отсутствующие машины) ходов нет.
+    """
+    np = _numpy()
+    lane = max(width, height)
+    shape = (2, max(CAR_LENGTHS) + 1, lane, 1 << lane)
+    back = np.zeros(shape, dtype=np.uint64)
+    ahead = np.zeros(shape, dtype=np.uint64)
+    for horizontal, lane_length in ((0, height), (1, width)):
+        for car_length in CAR_LENGTHS:
+            table = slide_table(lane_length, car_length, bool(horizontal), False)
+            for pos, entries in enumerate(table):
+                for mask, moves in enumerate(entries):
+                    for delta, _, distance in moves:
+                        target = ahead if delta > 0 else back
+                        target[horizontal, car_length, pos, mask] = distance
+    return back, ahead
+
+
+class BatchBFS:
+    """BFS сразу по всем доскам пакета.
+
+    Все доски одного размера; машины дополняются до наибольшего их числа
+    в пакете пустыми местами длины 0.
+    """
+
+    def __init__(self, boards):
+        np = _numpy()
+        self.np = np
+        self.boards = boards
+        size = boards[0].size
+        params = FIELD_SIZES[size]
+        width, height = params['width'], params['height']
+        lane = max(width, height)
+        cars = max(board.car_count for board in boards)
+
+        self.cars = cars
+        self.back, self.ahead = _slide_arrays(width, height)
+        self.lane_masks = np.array([(1 << height) - 1, (1 << width) - 1], dtype=np.uint64)
+
+        count = len(boards)
+        self.walls = np.array([board.walls for board in boards], dtype=np.uint64)
+        self.walls_t = np.array([board.walls_t for board in boards], dtype=np.uint64)
+        self.goals = np.array([board.goal for board in boards], dtype=np.int64)
+        self.masks = np.zeros((count, cars, lane), dtype=np.uint64)
+        self.masks_t = np.zeros((count, cars, lane), dtype=np.uint64)
+        self.lane_shifts = np.zeros((count, cars), dtype=np.uint64)
+        self.horizontal = np.zeros((count, cars), dtype=np.intp)
+        self.lengths = np.zeros((count, cars), dtype=np.intp)
+        for level, board in enumerate(boards):
+            for car in range(board.car_count):
+                span = len(board.masks[car])
+                self.masks[level, car, :span] = board.masks[car]
+                self.masks_t[level, car, :span] = board.masks_t[car]
+                self.lane_shifts[level, car] = board.lane_shifts[car]
+                self.horizontal[level, car] = board.horizontal[car]
+                self.lengths[level, car] = board.lengths[car]
+
+        self.nodes_expanded = 0
+        self.generated = 0
+        self.max_frontier = 0
+        self.states_stored = 0
+
+    def expand(self, levels, states):
+        """Все потомки слоя (уровни, состояния), с повторами"""
+        np = self.np
+        positions = [((states >> np.uint64(POS_BITS * car)) & np.uint64(POS_MASK)).astype(np.intp)
+                     for car in range(self.cars)]
+
+        occ = self.walls[levels]
+        occ_t = self.walls_t[levels]
+        for car, pos in enumerate(positions):
+            occ |= self.masks[levels, car, pos]
+            occ_t |= self.masks_t[levels, car, pos]
+
+        child_levels = []
+        child_states = []
+        for car, pos in enumerate(positions):
+            horizontal = self.horizontal[levels, car]
+            shift = self.lane_shifts[levels, car]
+            lane = np.where(horizontal == 1, occ >> shift, occ_t >> shift) & self.lane_masks[horizontal]
+            index = (horizontal, self.lengths[levels, car], pos, lane.astype(np.intp))
+            car_shift = np.uint64(POS_BITS * car)
+
+            back = self.back[index]
+            moved = back > 0
+            child_levels.append(levels[moved])
+            child_states.append(states[moved] - (back[moved] << car_shift))
+            ahead = self.ahead[index]
+            moved = ahead > 0
+            child_levels.append(levels[moved])
+            child_states.append(states[moved] + (ahead[moved] << car_shift))
+
+        child_levels = np.concatenate(child_levels)
+        child_states = np.concatenate(child_states)
+        self.nodes_expanded += len(levels)
+        self.generated += len(child_levels)
+        return child_levels, child_states
+
+    def merge(self, seen_levels, seen_states, levels, states):
+        """Новые пары (уровень, состояние) и посещённые вместе с ними.
+
+        seen_* отсортированы по (уровень, состояние) и не повторяются.
+        Потомки сортируются np.lexsort и сверяются с посещёнными двоичным
+        поиском внутри отрезка своего уровня, а новые вставляются на
+        найденные места, так что посещённые заново не сортируются.
+        Возвращает (новые уровни, новые состояния, посещённые уровни,
+        посещённые состояния), всё отсортировано так же.
+        """
+        np = self.np
+        order = np.lexsort((states, levels))
+        levels, states = levels[order], states[order]
+        first = np.ones(len(levels), dtype=bool)
+        first[1:] = (levels[1:] != levels[:-1]) | (states[1:] != states[:-1])
+        levels, states = levels[first], states[first]
+
+        # Отрезок посещённых своего уровня сужается до места вставки
+        lo = np.searchsorted(seen_levels, levels, 'left')
+        hi = np.searchsorted(seen_levels, levels, 'right')
+        last = max(len(seen_levels) - 1, 0)
+        active = lo < hi
+        while active.any():
+            mid = (lo + hi) >> 1
+            less = seen_states[np.minimum(mid, last)] < states
+            lo = np.where(active & less, mid + 1, lo)
+            hi = np.where(active & ~less, mid, hi)
+            active = lo < hi
+
+        fresh = np.ones(len(levels), dtype=bool)
+        if len(seen_levels):
+            index = np.minimum(lo, last)
+            fresh = (lo == len(seen_levels)) | (seen_levels[index] != levels) | (seen_states[index] != states)
+        levels, states, lo = levels[fresh], states[fresh], lo[fresh]
+        return levels, states, np.insert(seen_levels, lo, levels), np.insert(seen_states, lo, states)
+
+    def run(self, max_depth=None):
+        """Длины решений по доскам пакета; None — нет решения (или глубже max_depth)"""
+        np = self.np
+        count = len(self.boards)
+        results = [None] * count
+        solved = np.zeros(count, dtype=bool)
+
+        starts = np.array([board.initial_state for board in self.boards], dtype=np.uint64)
+        # Доски без красной машины на нужной строке в поиск не попадают
+        at_goal = (starts & np.uint64(POS_MASK)).astype(np.int64) == self.goals
+        for level in np.flatnonzero(at_goal):
+            results[level] = 0
+        solved |= at_goal | (self.goals < 0)
+
+        # Уровни идут по возрастанию, так что фронт уже отсортирован
+        levels = np.flatnonzero(~solved)
+        states = starts[~solved]
+        seen_levels, seen_states = levels, states
+        depth = 0
+
+        while len(levels) and (max_depth is None or depth < max_depth):
+            depth += 1
+            self.max_frontier = max(self.max_frontier, len(levels))
+            levels, states, seen_levels, seen_states = self.merge(
+                seen_levels, seen_states, *self.expand(levels, states))
+
+            red = (states & np.uint64(POS_MASK)).astype(np.int64)
+            for level in np.unique(levels[red == self.goals[levels]]):
+                results[level] = depth
+                solved[level] = True
+
+            # Фронты решённых досок больше не раскрываются
+            active = ~solved[levels]
+            levels, states = levels[active], states[active]
+
+        self.states_stored = len(seen_levels)
+        return results
+
+
+def solve_batch(configs, size, batch_size=DEFAULT_BATCH_SIZE, max_depth=None, stats=None):
+    """Длины решений для списка уровней одного размера (None — нерешаемый).
+
+    Уровни решаются пакетами не больше batch_size. Счётчики пакетов
+    складываются в stats (SearchStats), если он передан.
+    """
+    _numpy()
+    boards = [Board(config, size) for config in configs]
+    results = []
+
+    for start in range(0, len(boards), batch_size):
+        engine = BatchBFS(boards[start:start + batch_size])
+        start_time = time.perf_counter()
+        found = engine.run(max_depth)
+        if stats is not None:
+            _record(stats, engine, found, time.perf_counter() - start_time)
+        results.extend(found)
+
+    return results
+
+
+def _record(stats, engine, results, elapsed):
+    """Итоги пакета в SearchStats: каждая доска считается отдельным решением"""
+    stats.solves += len(results)
+    stats.solved += sum(steps is not None for steps in results)
+    stats.expanded += engine.nodes_expanded
+    stats.generated += engine.generated
+    stats.stored += engine.states_stored
+    stats.max_frontier = max(stats.max_frontier, engine.max_frontier)
+    stats.time += elapsed
@@ -0,0 +1,88 @@
+"""Поиск в ширину и алгоритм Дейкстры.
+
+При единичной цене хода Дейкстра раскрывает состояния в том же порядке,
+что и BFS, и оставлен для сравнения со старыми замерами.
+"""
+import heapq
+from collections import deque
+
+from .engine import Engine
+from .paths import reconstruct_path
+
+
+class BFS(Engine):
+    def run(self, want_path=True):
+        """Проверка цели при генерации: решение находится на слой раньше"""
+        board = self.board
+        stats = self.stats
+        max_depth = self.max_depth
+        start = board.initial_state
+        if board.is_solved(start):
+            return [] if want_path else 0
+
+        # Для каждого состояния храним только (родитель, ход)
+        parents = {start: None}
+        queue = deque([(start, 0)])
+
+        while queue:
+            state, depth = queue.popleft()
+            if depth == max_depth:
+                # Очередь упорядочена по глубине: решения не длиннее max_depth нет
+                self.cut_off = True
+                break
+            self.nodes_expanded += 1
+            successors = self.successors(state)
+            if stats is not None:
+                stats.expand(len(successors), len(queue))
+
+            for move, new_state in successors:
+                if new_state in parents:
+                    continue
+                parents[new_state] = (state, move)
+
+                if board.is_solved(new_state):
+                    self.states_stored = len(parents)
+                    return reconstruct_path(parents, new_state) if want_path else depth + 1
+                queue.append((new_state, depth + 1))
+
+        self.states_stored = len(parents)
+        return None
+
+
+class Dijkstra(Engine):
+    def run(self, want_path=True):
+        board = self.board
+        stats = self.stats
+        start = board.initial_state
+
+        queue = [(0, start)]
+        costs = {start: 0}
+        parents = {start: None}
+        visited = set()
+
+        while queue:
+            cost, state = heapq.heappop(queue)
+            if state in visited:
+                continue
+            if self.max_depth is not None and cost > self.max_depth:
+                self.cut_off = True
+                break
+            visited.add(state)
+            self.nodes_expanded += 1
+
+            if board.is_solved(state):
+                self.states_stored = len(costs)
+                return reconstruct_path(parents, state) if want_path else cost
+
+            successors = self.successors(state)
+            if stats is not None:
+                stats.expand(len(successors), len(queue))
+
+            for move, new_state in successors:
+                if new_state not in costs or cost + 1 < costs[new_state]:
+                    costs[new_state] = cost + 1
+                    parents[new_state] = (state, move)
+                    heapq.heappush(queue, (cost + 1, new_state))
+
+        self.states_stored = len(costs)
+        return None
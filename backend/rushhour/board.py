@@ -0,0 +1,225 @@
+"""Битовое представление уровня Rush Hour.
+
+Раскладка уровня (размер поля, стены, машины и их полосы) не меняется во
+время решения, поэтому разбирается один раз в Board. Состояние — одно целое
+число, в котором позиции всех машин упакованы по POS_BITS бит: оно
+хэшируется и сравнивается без выделения памяти, а ход меняет его одним
+сложением. Маски занятости клеток восстанавливаются за O(машин): одна по
+строкам, вторая по столбцам, чтобы полоса любой машины вырезалась сдвигом.
+"""
+from .config import FIELD_SIZES, size_for_config
+from .moves import slide_table, reverse_slide_table
+
+POS_BITS = 3
+POS_MASK = (1 << POS_BITS) - 1
+
+RED_CAR = 'A'
+EMPTY = 'o'
+WALL = 'x'
+
+
+class Board:
+    def __init__(self, config, size=None, all_slides=False):
+        """Разбирает строку уровня.
+
+        По умолчанию, как и в генераторе, машина за один ход сдвигается до
+        упора; all_slides=True разрешает сдвиг на любое расстояние.
+        """
+        self.size = size or size_for_config(config)
+        params = FIELD_SIZES[self.size]
+        self.width = params['width']
+        self.height = params['height']
+        self.red_row = params['red_row']
+        self.all_slides = all_slides
+
+        if len(config) != self.width * self.height:
+            raise ValueError(f"Длина строки {len(config)} не совпадает с полем {self.size}")
+
+        cells = {}
+        for i, c in enumerate(config):
+            if c != EMPTY and c != WALL:
+                cells.setdefault(c, []).append(i)
+
+        # Красная машина всегда получает индекс 0, остальные — в порядке обхода
+        letters = sorted(cells, key=lambda c: (c != RED_CAR, cells[c][0]))
+
+        self.walls = 0
+        self.walls_t = 0
+        for i, c in enumerate(config):
+            if c == WALL:
+                self._add_wall(i)
+
+        self.letters = []
+        self.horizontal = []
+        self.lengths = []
+        self.lanes = []
+        self.shifts = []
+        self.masks = []
+        self.masks_t = []
+        self.lane_shifts = []
+        self.tables = []
+        self.reverse_tables = []
+        state = 0
+
+        for c in letters:
+            positions = cells[c]
+            if len(positions) < 2:
+                # Одиночная клетка не может двигаться и ведёт себя как стена
+                self._add_wall(positions[0])
+                continue
+
+            row, col = divmod(positions[0], self.width)
+            horizontal = positions[1] == positions[0] + 1
+            length = len(positions)
+            car = len(self.letters)
+
+            self.letters.append(c)
+            self.horizontal.append(horizontal)
+            self.lengths.append(length)
+            self.lanes.append(row if horizontal else col)
+            self.shifts.append(POS_BITS * car)
+
+            if horizontal:
+                span = self.width - length + 1
+                body = (1 << length) - 1
+                body_t = sum(1 << (i * self.height) for i in range(length))
+                self.masks.append([body << (row * self.width + p) for p in range(span)])
+                self.masks_t.append([body_t << (p * self.height + row) for p in range(span)])
+                self.lane_shifts.append(row * self.width)
+                self.tables.append(slide_table(self.width, length, True, all_slides))
+                self.reverse_tables.append(reverse_slide_table(self.width, length, True, all_slides))
+                state |= col << (POS_BITS * car)
+            else:
+                span = self.height - length + 1
+                body = sum(1 << (i * self.width) for i in range(length))
+                body_t = (1 << length) - 1
+                self.masks.append([body << (p * self.width + col) for p in range(span)])
+                self.masks_t.append([body_t << (col * self.height + p) for p in range(span)])
+                self.lane_shifts.append(col * self.height)
+                self.tables.append(slide_table(self.height, length, False, all_slides))
+                self.reverse_tables.append(reverse_slide_table(self.height, length, False, all_slides))
+                state |= row << (POS_BITS * car)
+
+        self.car_count = len(self.letters)
+        self.initial_state = state
+
+        red_ok = (self.car_count > 0 and self.letters[0] == RED_CAR and
+                  self.horizontal[0] and self.lanes[0] == self.red_row)
+        # Для уровней без красной машины на нужной строке цель недостижима
+        self.goal = self.width - self.lengths[0] if red_ok else -1
+
+    def _add_wall(self, cell):
+        row, col = divmod(cell, self.width)
+        self.walls |= 1 << cell
+        self.walls_t |= 1 << (col * self.height + row)
+
+    def position(self, state, car):
+        """Позиция машины вдоль её полосы"""
+        return (state >> self.shifts[car]) & POS_MASK
+
+    def positions(self, state):
+        """Позиции всех машин"""
+        return [(state >> shift) & POS_MASK for shift in self.shifts]
+
+    def occupancy(self, state):
+        """Маска занятых клеток (стены и машины)"""
+        occ = self.walls
+        masks = self.masks
+        for car, shift in enumerate(self.shifts):
+            occ |= masks[car][(state >> shift) & POS_MASK]
+        return occ
+
+    def is_solved(self, state):
+        """Красная машина стоит у выхода"""
+        return state & POS_MASK == self.goal
+
+    def occupancies(self, state):
+        """Маски занятости по строкам и по столбцам"""
+        occ = self.walls
+        occ_t = self.walls_t
+        masks = self.masks
+        masks_t = self.masks_t
+        for car, shift in enumerate(self.shifts):
+            pos = (state >> shift) & POS_MASK
+            occ |= masks[car][pos]
+            occ_t |= masks_t[car][pos]
+        return occ, occ_t
+
+    def successors(self, state):
+        """Возвращает список пар (ход, новое состояние)"""
+        return self._moves(state, self.tables, 1)
+
+    def predecessors(self, state):
+        """Пары (ход, предыдущее состояние): ход переводит предыдущее в state"""
+        return self._moves(state, self.reverse_tables, -1)
+
+    def _moves(self, state, tables, sign):
+        occ, occ_t = self.occupancies(state)
+        row_lane = (1 << self.width) - 1
+        col_lane = (1 << self.height) - 1
+        result = []
+
+        for car, shift in enumerate(self.shifts):
+            pos = (state >> shift) & POS_MASK
+            if self.horizontal[car]:
+                lane = (occ >> self.lane_shifts[car]) & row_lane
+            else:
+                lane = (occ_t >> self.lane_shifts[car]) & col_lane
+            for delta, direction, distance in tables[car][pos][lane]:
+                result.append(((car, direction, distance), state + (delta << shift)))
+
+        return result
+
+    def next_states(self, state):
+        """Состояния, достижимые одним ходом (без описания ходов)"""
+        return self._neighbours(state, self.tables)
+
+    def prev_states(self, state):
+        """Состояния, из которых state достижимо одним ходом"""
+        return self._neighbours(state, self.reverse_tables)
+
+    def _neighbours(self, state, tables):
+        occ, occ_t = self.occupancies(state)
+        row_lane = (1 << self.width) - 1
+        col_lane = (1 << self.height) - 1
+        result = []
+
+        for car, shift in enumerate(self.shifts):
+            pos = (state >> shift) & POS_MASK
+            if self.horizontal[car]:
+                lane = (occ >> self.lane_shifts[car]) & row_lane
+            else:
+                lane = (occ_t >> self.lane_shifts[car]) & col_lane
+            for delta, _, _ in tables[car][pos][lane]:
+                result.append(state + (delta << shift))
+
+        return result
+
+    def apply_move(self, state, move):
+        """Применяет ход (машина, направление, расстояние) к состоянию"""
+        car, direction, distance = move
+        if direction in ('left', 'up'):
+            distance = -distance
+        return state + (distance << self.shifts[car])
+
+    def blockers(self, state):
+        """Количество занятых клеток между красной машиной и выходом"""
+        if self.goal < 0:
+            return float('inf')
+        first = self.red_row * self.width + (state & POS_MASK) + self.lengths[0]
+        ahead = (self.occupancy(state) >> first) & ((1 << (self.goal - (state & POS_MASK))) - 1)
+        return ahead.bit_count()
+
+    def to_config(self, state):
+        """Собирает строку уровня для состояния"""
+        field = [EMPTY] * (self.width * self.height)
+        for i in range(self.width * self.height):
+            if self.walls >> i & 1:
+                field[i] = WALL
+        for car, letter in enumerate(self.letters):
+            cells = self.masks[car][self.position(state, car)]
+            while cells:
+                low = cells & -cells
+                field[low.bit_length() - 1] = letter
+                cells ^= low
+        return ''.join(field)
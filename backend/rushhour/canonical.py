@@ -0,0 +1,85 @@
+"""Канонический вид строки уровня.
+
+Уровни, отличающиеся только буквами машин, — одна и та же головоломка,
+поэтому машины перенумеровываются в порядке обхода поля: красная остаётся
+'A', остальные получают 'B', 'C', ... по первой клетке. Если строка
+выхода — средняя строка поля (5x5 и 7x7), отражение поля по вертикали
+переводит уровень в равносильный с той же длиной решения: ходы вверх и
+вниз меняются местами. Каноническим считается меньший из двух видов.
+
+Номера машин в Board зависят только от расположения машин, поэтому
+перенумерация решения не меняет; при отражении ходы переводит map_moves.
+"""
+from .board import EMPTY, RED_CAR, WALL
+from .config import FIELD_SIZES, size_for_config
+
+LETTERS = 'BCDEFGHIJKLMNOPQRSTUVWXYZ'
+MIRRORED = {'up': 'down', 'down': 'up'}
+
+
+def relabel(config):
+    """Буквы машин в порядке первого появления, красная — 'A'"""
+    names = {RED_CAR: RED_CAR, EMPTY: EMPTY, WALL: WALL}
+    letters = iter(LETTERS)
+    result = []
+    for c in config:
+        if c not in names:
+            names[c] = next(letters)
+        result.append(names[c])
+    return ''.join(result)
+
+
+def can_mirror(size):
+    """Переходит ли строка выхода в себя при отражении по вертикали"""
+    params = FIELD_SIZES[size]
+    return 2 * params['red_row'] == params['height'] - 1
+
+
+def mirror(config, size):
+    """Поле, отражённое по вертикали (строки в обратном порядке)"""
+    width = FIELD_SIZES[size]['width']
+    rows = [config[i:i + width] for i in range(0, len(config), width)]
+    return ''.join(reversed(rows))
+
+
+def canonical_transform(config, size=None):
+    """Пара (канонический вид, получен ли он отражением)"""
+    size = size or size_for_config(config)
+    plain = relabel(config)
+    if can_mirror(size):
+        mirrored = relabel(mirror(config, size))
+        if mirrored < plain:
+            return mirrored, True
+    return plain, False
+
+
+def canonical(config, size=None):
+    return canonical_transform(config, size)[0]
+
+
+def map_moves(moves, source, target, size=None):
+    """Переводит ходы решения source в ходы для target — его отражения.
+
+    Машина source сопоставляется машине target, занимающей отражённую
+    клетку; вертикальные ходы меняют направление.
+    """
+    size = size or size_for_config(source)
+    width = FIELD_SIZES[size]['width']
+    height = FIELD_SIZES[size]['height']
+
+    def order(config):
+        # Тот же порядок машин, что и в Board: красная первой, затем по первой клетке
+        first = {}
+        for i, c in enumerate(config):
+            if c != EMPTY and c != WALL:
+                first.setdefault(c, i)
+        return sorted((c for c in first if config.count(c) > 1), key=lambda c: (c != RED_CAR, first[c]))
+
+    target_index = {c: car for car, c in enumerate(order(target))}
+    mapping = []
+    for c in order(source):
+        row, col = divmod(source.index(c), width)
+        mapping.append(target_index[target[(height - 1 - row) * width + col]])
+
+    return [(mapping[car], MIRRORED.get(direction, direction), distance)
+            for car, direction, distance in moves]
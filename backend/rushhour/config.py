@@ -0,0 +1,25 @@
+# Конфигурация размеров поля
+FIELD_SIZES = {
+    '5x5': {
+        'width': 5, 'height': 5, 'red_row': 2,
+        'thresholds': {'EASY_MIN': 6, 'EASY_MAX': 10, 'MEDIUM_MIN': 11, 'MEDIUM_MAX': 15, 'HARD_MIN': 16}
+    },
+    '6x6': {
+        'width': 6, 'height': 6, 'red_row': 2,
+        'thresholds': {'EASY_MIN': 10, 'EASY_MAX': 14, 'MEDIUM_MIN': 15, 'MEDIUM_MAX': 20, 'HARD_MIN': 21}
+    },
+    '7x7': {
+        'width': 7, 'height': 7, 'red_row': 3,
+        'thresholds': {'EASY_MIN': 12, 'EASY_MAX': 16, 'MEDIUM_MIN': 17, 'MEDIUM_MAX': 22, 'HARD_MIN': 23}
+    }
+}
+
+RED_LENGTH = 2
+
+
+def size_for_config(config):
+    """Определяет размер поля по длине строки уровня"""
+    for size, params in FIELD_SIZES.items():
+        if params['width'] * params['height'] == len(config):
+            return size
+    raise ValueError(f"Неподдерживаемый размер поля: длина строки {len(config)}")
@@ -0,0 +1,38 @@
+"""Общий интерфейс поисковых движков.
+
+Движок создаётся для конкретного Board и решает его методом
+search(want_path): список ходов, при want_path=False — только их число,
+None, если решения нет. Число раскрытых состояний копится в
+nodes_expanded, а в states_stored — сколько состояний движок хранил.
+Семантику ходов задаёт Board, движки от неё не зависят.
+
+max_depth ограничивает длину решения: как только ясно, что решения не
+длиннее max_depth нет, поиск прекращается, возвращает None и ставит
+cut_off — такой None не означает, что уровень нерешаем.
+
+Подклассы реализуют run(want_path) и берут ходы из self.successors,
+чтобы при включённой статистике генерация ходов попадала в замеры.
+"""
+import time
+
+
+class Engine:
+    def __init__(self, board, stats=None, max_depth=None):
+        self.board = board
+        self.stats = stats
+        self.max_depth = max_depth
+        self.cut_off = False
+        self.nodes_expanded = 0
+        self.states_stored = 0
+        self.successors = board.successors if stats is None else stats.timed('moves', board.successors)
+
+    def search(self, want_path=True):
+        if self.stats is None:
+            return self.run(want_path)
+        start = time.perf_counter()
+        result = self.run(want_path)
+        self.stats.finish(self.states_stored, time.perf_counter() - start, result)
+        return result
+
+    def run(self, want_path):
+        raise NotImplementedError
@@ -0,0 +1,186 @@
+"""Допустимые эвристики для A* и IDA*.
+
+Эвристика создаётся под конкретный Board через make_heuristic(name, board)
+и дальше вызывается как h(state). Все варианты, кроме исходного blockers,
+не переоценивают число ходов ни при сдвиге до упора, ни при сдвиге на
+любое расстояние, поэтому длины решений, по которым классифицируется
+сложность, остаются точными.
+
+- blockers — занятые клетки между красной машиной и выходом (как раньше);
+- depth    — ход красной машины, по ходу на каждую блокирующую машину и
+             ещё один, если какой-то блокирующей машине с обеих сторон
+             мешают машины, которые иначе двигать не нужно;
+- pdb      — сумма точных расстояний по столбцам, пересекающим путь
+             красной машины (база образцов из rushhour.pdb);
+- max      — максимум из depth и pdb.
+"""
+from .board import POS_MASK
+from .pdb import CAR_BODY, CAR_HEAD, UNREACHABLE, WALL_CELL, lane_table
+
+INF = float('inf')
+
+
+class Blockers:
+    """Исходная эвристика генератора: занятые клетки на пути красной машины"""
+
+    def __init__(self, board):
+        self.board = board
+
+    def __call__(self, state):
+        return self.board.blockers(state)
+
+
+class BlockerDepth:
+    def __init__(self, board):
+        self.board = board
+        width = board.width
+        self.path_cells = [board.red_row * width + col for col in range(width)]
+
+    def _owners(self, state):
+        board = self.board
+        owners = [None] * (board.width * board.height)
+        for car, shift in enumerate(board.shifts):
+            cells = board.masks[car][(state >> shift) & POS_MASK]
+            while cells:
+                low = cells & -cells
+                owners[low.bit_length() - 1] = car
+                cells ^= low
+        return owners
+
+    def __call__(self, state):
+        board = self.board
+        if board.goal < 0:
+            return INF
+        red = state & POS_MASK
+        if red == board.goal:
+            return 0
+
+        width, height, red_row = board.width, board.height, board.red_row
+        walls = board.walls
+        owners = self._owners(state)
+
+        blockers = []
+        for col in range(red + board.lengths[0], width):
+            cell = red_row * width + col
+            if walls >> cell & 1:
+                return INF
+            car = owners[cell]
+            if car is not None:
+                if board.horizontal[car]:
+                    return INF
+                blockers.append(car)
+
+        counted = set(blockers)
+        counted.add(0)
+
+        extra = 0
+        for car in blockers:
+            col = board.lanes[car]
+            top = board.position(state, car)
+            length = board.lengths[car]
+            feasible = False
+            needs_other = True
+
+            # Уход вверх: машина целиком выше red_row; вниз — целиком ниже
+            for rows in (range(red_row - length, top), range(top + length, red_row + length + 1)):
+                if rows.start < 0 or rows.stop > height:
+                    continue
+                blocked_by_wall = False
+                others = False
+                for row in rows:
+                    cell = row * width + col
+                    if walls >> cell & 1:
+                        blocked_by_wall = True
+                        break
+                    owner = owners[cell]
+                    if owner is not None and owner not in counted:
+                        others = True
+                if blocked_by_wall:
+                    continue
+                feasible = True
+                if not others:
+                    needs_other = False
+
+            if not feasible:
+                return INF
+            if needs_other:
+                extra = 1
+
+        return 1 + len(blockers) + extra
+
+
+class LanePatterns:
+    def __init__(self, board):
+        self.board = board
+        self.table = lane_table(board.height, board.red_row)
+
+        width, height = board.width, board.height
+        self.wall_codes = [0] * width
+        for row in range(height):
+            for col in range(width):
+                if board.walls >> (row * width + col) & 1:
+                    self.wall_codes[col] += WALL_CELL * 4 ** row
+
+        self.column_cars = [[] for _ in range(width)]
+        self.car_codes = {}
+        self.row_cars = []
+        for car in range(1, board.car_count):
+            length = board.lengths[car]
+            if board.horizontal[car]:
+                if board.lanes[car] == board.red_row:
+                    self.row_cars.append(car)
+                continue
+            self.column_cars[board.lanes[car]].append(car)
+            self.car_codes[car] = [
+                CAR_HEAD * 4 ** pos + sum(CAR_BODY * 4 ** (pos + k) for k in range(1, length))
+                for pos in range(height - length + 1)
+            ]
+
+    def __call__(self, state):
+        board = self.board
+        if board.goal < 0:
+            return INF
+        red = state & POS_MASK
+        if red == board.goal:
+            return 0
+
+        first = red + board.lengths[0]
+        for car in self.row_cars:
+            if board.position(state, car) >= first:
+                return INF
+
+        table = self.table
+        total = 1
+        for col in range(first, board.width):
+            code = self.wall_codes[col]
+            for car in self.column_cars[col]:
+                code += self.car_codes[car][(state >> board.shifts[car]) & POS_MASK]
+            value = table[code]
+            if value == UNREACHABLE:
+                return INF
+            total += value
+        return total
+
+
+class MaxOf:
+    def __init__(self, *heuristics):
+        self.heuristics = heuristics
+
+    def __call__(self, state):
+        return max(h(state) for h in self.heuristics)
+
+
+HEURISTICS = {
+    'blockers': Blockers,
+    'depth': BlockerDepth,
+    'pdb': LanePatterns,
+    'max': lambda board: MaxOf(BlockerDepth(board), LanePatterns(board)),
+}
+
+
+def make_heuristic(name, board):
+    """Создаёт эвристику по имени для данного поля"""
+    try:
+        return HEURISTICS[name](board)
+    except KeyError:
+        raise ValueError(f"Неизвестная эвристика: {name}") from None
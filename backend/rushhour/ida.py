@@ -0,0 +1,127 @@
+"""IDA* с таблицей транспозиций фиксированного размера.
+
+Поиск в глубину с растущим порогом f. Ходы делаются и отменяются на общих
+масках занятости и общем пути, ключ Цобриста обновляется за O(1), а
+нижние оценки исчерпанных поддеревьев сохраняются в TranspositionTable и
+переживают итерации.
+"""
+from operator import itemgetter
+
+from .board import POS_MASK
+from .engine import Engine
+from .heuristics import INF, make_heuristic
+from .transposition import DEFAULT_MAX_BYTES, TranspositionTable
+from .zobrist import Zobrist
+
+
+class IDAStar(Engine):
+    def __init__(self, board, heuristic='max', max_table_bytes=DEFAULT_MAX_BYTES, stats=None, max_depth=None):
+        super().__init__(board, stats, max_depth)
+        # Ходы строятся прямо в children(), их время статистика относит к прочему
+        self.estimate = make_heuristic(heuristic, board)
+        if stats is not None:
+            self.estimate = stats.timed('heuristic', self.estimate)
+        self.row_lane = (1 << board.width) - 1
+        self.col_lane = (1 << board.height) - 1
+        # Маски занятости текущего состояния, меняются ходами на месте
+        self.occ = self.occ_t = 0
+        self.zobrist = Zobrist(board)
+        # Оценки из таблицы верны для любого порога и живут все итерации
+        self.table = TranspositionTable(max_table_bytes)
+        self.solution = None
+
+    def make_move(self, car, old, new):
+        """Сдвигает машину в масках занятости; make_move(car, new, old) отменяет ход"""
+        masks, masks_t = self.board.masks[car], self.board.masks_t[car]
+        self.occ ^= masks[old] ^ masks[new]
+        self.occ_t ^= masks_t[old] ^ masks_t[new]
+
+    def children(self, state):
+        """Потомки текущего состояния по возрастанию эвристики.
+
+        Маски занятости берутся из self.occ и self.occ_t, поэтому каждый
+        потомок строится и оценивается ровно один раз.
+        """
+        board = self.board
+        occ, occ_t = self.occ, self.occ_t
+        result = []
+
+        for car, shift in enumerate(board.shifts):
+            pos = (state >> shift) & POS_MASK
+            if board.horizontal[car]:
+                lane = (occ >> board.lane_shifts[car]) & self.row_lane
+            else:
+                lane = (occ_t >> board.lane_shifts[car]) & self.col_lane
+            for delta, direction, distance in board.tables[car][pos][lane]:
+                new_state = state + (delta << shift)
+                h = self.estimate(new_state)
+                if h != INF:
+                    result.append((h, car, pos, pos + delta, new_state, (car, direction, distance)))
+
+        result.sort(key=itemgetter(0))
+        return result
+
+    def run(self, want_path=True):
+        board = self.board
+        start = board.initial_state
+        key = self.zobrist.key(start)
+        h = self.estimate(start)
+        if h == INF:
+            return None
+        self.occ, self.occ_t = board.occupancies(start)
+        threshold = h
+
+        while self.solution is None:
+            if self.max_depth is not None and threshold > self.max_depth:
+                self.cut_off = True
+                return None
+            result = self._search(start, key, [], 0, h, threshold)
+            # Память IDA* — это таблица транспозиций
+            self.states_stored = len(self.table)
+            if result == INF:
+                return None  # Решение не найдено
+            threshold = result  # Увеличиваем порог для следующей итерации
+
+        return self.solution if want_path else len(self.solution)
+
+    def _search(self, state, key, path, g, h, threshold):
+        """Рекурсивный проход с порогом; возвращает минимальное f за порогом.
+
+        h — эвристика состояния, уже посчитанная родителем при сортировке.
+        """
+        self.nodes_expanded += 1
+        h = max(h, self.table.lookup(key, state))
+        f = g + h
+
+        if f > threshold:
+            return f
+        if self.board.is_solved(state):
+            self.solution = path.copy()
+            return f
+
+        min_threshold = INF
+        children = self.children(state)
+        if self.stats is not None:
+            # Фронт поиска в глубину — текущий путь
+            self.stats.expand(len(children), g)
+        for child_h, car, old, new, new_state, move in children:
+            if g + 1 + child_h > threshold:
+                # Потомки отсортированы: остальные тоже за порогом
+                min_threshold = min(min_threshold, g + 1 + child_h)
+                break
+
+            self.make_move(car, old, new)
+            path.append(move)
+            result = self._search(new_state, self.zobrist.update(key, car, old, new),
+                                  path, g + 1, child_h, threshold)
+            path.pop()
+            self.make_move(car, new, old)
+
+            if self.solution is not None:
+                return result
+            if result < min_threshold:
+                min_threshold = result
+
+        # Поддерево исчерпано: до решения не меньше min_threshold - g ходов
+        self.table.store(key, state, min_threshold - g, threshold - g)
+        return min_threshold
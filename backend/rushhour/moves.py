@@ -0,0 +1,108 @@
+"""Предвычисленные таблицы ходов.
+
+Для полосы длины n (строка или столбец) и машины длины L таблица по
+позиции машины и маске занятости полосы сразу даёт список допустимых
+сдвигов. Генерация ходов сводится к одному обращению к таблице на машину
+вместо обхода клеток. Таблицы зависят только от геометрии, поэтому
+строятся один раз на процесс и общие для всех решений.
+"""
+from functools import lru_cache
+
+from .config import FIELD_SIZES
+
+FORWARD = {True: 'right', False: 'down'}
+BACKWARD = {True: 'left', False: 'up'}
+
+CAR_LENGTHS = (2, 3)
+
+
+@lru_cache(maxsize=None)
+def slide_table(lane_length, car_length, horizontal, all_slides):
+    """Таблица table[позиция][маска полосы] -> ((сдвиг, направление, расстояние), ...)
+
+    Маска включает клетки самой машины; для масок, где машины нет на
+    указанной позиции, записи пустые.
+    """
+    forward = FORWARD[horizontal]
+    backward = BACKWARD[horizontal]
+    body = (1 << car_length) - 1
+    table = []
+
+    for pos in range(lane_length - car_length + 1):
+        entries = [()] * (1 << lane_length)
+        own = body << pos
+        for mask in range(1 << lane_length):
+            if mask & own != own:
+                continue
+
+            back = 0
+            while pos - back > 0 and not mask >> (pos - back - 1) & 1:
+                back += 1
+            ahead = 0
+            while pos + car_length + ahead < lane_length and not mask >> (pos + car_length + ahead) & 1:
+                ahead += 1
+
+            moves = []
+            if all_slides:
+                moves.extend((-d, backward, d) for d in range(1, back + 1))
+                moves.extend((d, forward, d) for d in range(1, ahead + 1))
+            else:
+                if back:
+                    moves.append((-back, backward, back))
+                if ahead:
+                    moves.append((ahead, forward, ahead))
+            entries[mask] = tuple(moves)
+        table.append(entries)
+
+    return table
+
+
+@lru_cache(maxsize=None)
+def reverse_slide_table(lane_length, car_length, horizontal, all_slides):
+    """Обратная таблица: из каких позиций машина могла попасть в текущую.
+
+    Записи (сдвиг к предыдущей позиции, направление хода, расстояние), где
+    направление — то, в котором машина ехала в state. При сдвиге на любое
+    расстояние предшественник — любая свободная позиция полосы; при сдвиге
+    до упора он есть только у машины, упёршейся в препятствие, и им может
+    быть любая клетка свободного участка с другой стороны.
+    """
+    forward = FORWARD[horizontal]
+    backward = BACKWARD[horizontal]
+    body = (1 << car_length) - 1
+    table = []
+
+    for pos in range(lane_length - car_length + 1):
+        entries = [()] * (1 << lane_length)
+        own = body << pos
+        for mask in range(1 << lane_length):
+            if mask & own != own:
+                continue
+
+            back = 0
+            while pos - back > 0 and not mask >> (pos - back - 1) & 1:
+                back += 1
+            ahead = 0
+            while pos + car_length + ahead < lane_length and not mask >> (pos + car_length + ahead) & 1:
+                ahead += 1
+
+            moves = []
+            if all_slides or not ahead:
+                # Упёрлись вперёд: приехали сзади с любого расстояния
+                moves.extend((-d, forward, d) for d in range(1, back + 1))
+            if all_slides or not back:
+                moves.extend((d, backward, d) for d in range(1, ahead + 1))
+            entries[mask] = tuple(moves)
+        table.append(entries)
+
+    return table
+
+
+def prebuild_tables(all_slides=False):
+    """Строит таблицы для всех размеров поля из FIELD_SIZES"""
+    for params in FIELD_SIZES.values():
+        for car_length in CAR_LENGTHS:
+            slide_table(params['width'], car_length, True, all_slides)
+            slide_table(params['height'], car_length, False, all_slides)
+            reverse_slide_table(params['width'], car_length, True, all_slides)
+            reverse_slide_table(params['height'], car_length, False, all_slides)
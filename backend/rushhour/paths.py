@@ -0,0 +1,20 @@
+"""Восстановление решения по указателям на родителя.
+
+Поисковые алгоритмы хранят для каждого посещённого состояния только пару
+(родитель, ход), а список ходов собирают один раз — когда цель найдена.
+"""
+
+
+def reconstruct_path(parents, state):
+    """Собирает ходы от начального состояния до state.
+
+    parents[s] = (родитель, ход); у начального состояния значение None.
+    """
+    path = []
+    link = parents[state]
+    while link is not None:
+        state, move = link
+        path.append(move)
+        link = parents[state]
+    path.reverse()
+    return path
@@ -0,0 +1,173 @@
+"""Базы образцов (pattern databases) для эвристик и их кэш на диске.
+
+Таблица для столбца зависит только от высоты поля и строки красной машины,
+поэтому строится один раз на размер поля и сохраняется в файл. Процессы
+решателя открывают файл через mmap только для чтения: страницы общие для
+всех процессов пула, а повторный запуск не тратит время на построение.
+
+Построить все таблицы заранее: python -m rushhour.pdb [каталог]
+"""
+import mmap
+import os
+import struct
+import sys
+from functools import lru_cache
+
+from .config import FIELD_SIZES
+
+UNREACHABLE = 255
+
+EMPTY_CELL, WALL_CELL, CAR_HEAD, CAR_BODY = range(4)
+
+
+def build_lane_table(height, red_row):
+    """База образцов для столбца высоты height.
+
+    Столбец кодируется числом по основанию 4 (клетка i — разряд i): пусто,
+    стена, начало или продолжение вертикальной машины. Горизонтальные
+    машины считаются пустыми клетками — это ослабление задачи, поэтому
+    оценка допустима. Значение — минимальное число ходов вертикальных машин,
+    освобождающих клетку red_row, или UNREACHABLE.
+    """
+    codes = []
+
+    def build(row, code):
+        if row == height:
+            codes.append(code)
+            return
+        build(row + 1, code)
+        build(row + 1, code + WALL_CELL * 4 ** row)
+        for length in range(2, height - row + 1):
+            car = CAR_HEAD * 4 ** row + sum(CAR_BODY * 4 ** (row + k) for k in range(1, length))
+            build(row + length, code + car)
+
+    build(0, 0)
+
+    table = bytearray([UNREACHABLE]) * (4 ** height)
+    frontier = [code for code in codes if code // 4 ** red_row % 4 == EMPTY_CELL]
+    for code in frontier:
+        table[code] = 0
+
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for code in frontier:
+            for neighbour in _lane_moves(code, height):
+                if table[neighbour] == UNREACHABLE:
+                    table[neighbour] = depth
+                    next_frontier.append(neighbour)
+        frontier = next_frontier
+
+    return table
+
+
+def _lane_moves(code, height):
+    """Коды столбца после одного сдвига одной машины на любое расстояние"""
+    digits = [code // 4 ** row % 4 for row in range(height)]
+    result = []
+    row = 0
+    while row < height:
+        if digits[row] != CAR_HEAD:
+            row += 1
+            continue
+        length = 1
+        while row + length < height and digits[row + length] == CAR_BODY:
+            length += 1
+        car = code - sum(digits[row + k] * 4 ** (row + k) for k in range(length))
+
+        top = row
+        while top > 0 and digits[top - 1] == EMPTY_CELL:
+            top -= 1
+        bottom = row
+        while bottom + length < height and digits[bottom + length] == EMPTY_CELL:
+            bottom += 1
+
+        for new_row in range(top, bottom + 1):
+            if new_row != row:
+                result.append(car + CAR_HEAD * 4 ** new_row +
+                              sum(CAR_BODY * 4 ** (new_row + k) for k in range(1, length)))
+        row += length
+    return result
+
+
+MAGIC = b'RHPD'
+VERSION = 1
+HEADER = struct.Struct('<4sBBB')
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def pdb_dir():
+    """Каталог с файлами баз; переопределяется переменной RUSHHOUR_PDB_DIR"""
+    return os.environ.get('RUSHHOUR_PDB_DIR', DEFAULT_DIR)
+
+
+def lane_table_path(height, red_row, directory=None):
+    return os.path.join(directory or pdb_dir(), f"lane_{height}_{red_row}.pdb")
+
+
+def save_lane_table(table, height, red_row, path):
+    """Атомарно записывает таблицу: параллельные процессы не увидят обрывок"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, height, red_row))
+        f.write(table)
+    os.replace(tmp_path, path)
+
+
+def load_lane_table(height, red_row, path):
+    """Открывает файл через mmap; None, если файла нет или он не подходит"""
+    try:
+        with open(path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    if (len(data) != HEADER.size + 4 ** height or
+            HEADER.unpack_from(data) != (MAGIC, VERSION, height, red_row)):
+        data.close()
+        return None
+    return memoryview(data)[HEADER.size:]
+
+
+@lru_cache(maxsize=None)
+def lane_table(height, red_row):
+    """Таблица столбца из кэша на диске; при отсутствии строится и сохраняется.
+
+    Если каталог недоступен для записи, таблица просто остаётся в памяти.
+    """
+    path = lane_table_path(height, red_row)
+    table = load_lane_table(height, red_row, path)
+    if table is not None:
+        return table
+
+    table = build_lane_table(height, red_row)
+    try:
+        save_lane_table(table, height, red_row, path)
+    except OSError:
+        pass
+    return table
+
+
+def load_all():
+    """Открывает таблицы для всех размеров поля (инициализатор пула)"""
+    for params in FIELD_SIZES.values():
+        lane_table(params['height'], params['red_row'])
+
+
+def build_all(directory=None):
+    """Строит и сохраняет таблицы для всех размеров поля из FIELD_SIZES"""
+    paths = []
+    for params in FIELD_SIZES.values():
+        height, red_row = params['height'], params['red_row']
+        path = lane_table_path(height, red_row, directory)
+        save_lane_table(build_lane_table(height, red_row), height, red_row, path)
+        paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    for path in build_all(sys.argv[1] if len(sys.argv) > 1 else None):
+        print(path)
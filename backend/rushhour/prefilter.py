@@ -0,0 +1,73 @@
+"""Дешёвая проверка кандидата до полного решения.
+
+Генератору нужны уровни с длиной решения в открытых диапазонах
+сложности, а большинство случайных кандидатов в них не попадает.
+screen() отсеивает такие кандидаты за малую долю цены A*:
+
+1. нижняя граница — допустимая эвристика max: INF значит, что решения
+   нет (стена или горизонтальная машина на пути красной, тупик в
+   столбце), а граница выше всех открытых диапазонов — что уровень
+   заведомо труднее нужного;
+2. при свободном пути красная машина решает уровень одним ходом;
+3. BFS глубиной до нижнего края открытых диапазонов и не больше
+   max_states состояний: найденное решение точно и короче нужного, а
+   исчерпанная компонента значит, что решения нет.
+
+Если ничего не доказано, возвращается UNKNOWN, и уровень решается как
+обычно. Ходы — те, что у Board (в генераторе — сдвиг до упора).
+"""
+from .heuristics import INF, make_heuristic
+
+PROBE_STATES = 2000
+
+# Проверка ничего не доказала, нужен полный поиск
+UNKNOWN = object()
+# Длина решения заведомо вне открытых диапазонов
+REJECT = object()
+
+
+def screen(board, bands, max_states=PROBE_STATES):
+    """Вердикт для уровня: REJECT, UNKNOWN, точная длина или None (решения нет).
+
+    bands — открытые диапазоны [(low, high)], high=None — без верхней границы.
+    """
+    if not bands:
+        return REJECT
+    start = board.initial_state
+    if board.is_solved(start):
+        return 0
+
+    bound = make_heuristic('max', board)(start)
+    if bound == INF:
+        return None
+    if bound > max(INF if high is None else high for _, high in bands):
+        return REJECT
+    if board.blockers(start) == 0:
+        return 1
+
+    return probe(board, min(low for low, _ in bands) - 1, max_states)
+
+
+def probe(board, max_depth, max_states=PROBE_STATES):
+    """BFS не глубже max_depth: длина, None (решения нет) или UNKNOWN"""
+    start = board.initial_state
+    seen = {start}
+    layer = [start]
+
+    for depth in range(1, max_depth + 1):
+        next_layer = []
+        for state in layer:
+            for new_state in board.next_states(state):
+                if new_state in seen:
+                    continue
+                if board.is_solved(new_state):
+                    return depth
+                seen.add(new_state)
+                next_layer.append(new_state)
+        if not next_layer:
+            return None  # Компонента исчерпана
+        if len(seen) > max_states:
+            return UNKNOWN
+        layer = next_layer
+
+    return UNKNOWN
@@ -0,0 +1,177 @@
+"""Постоянный кэш решений в SQLite.
+
+Для уровня хранится длина оптимального решения (NULL — решения нет),
+число раскрытых состояний и, если его просили, само решение. Ключ —
+канонический вид строки уровня (rushhour.canonical) и семантика ходов:
+длины со сдвигом до упора и на любое расстояние различаются. Решение
+хранится для канонического вида и переводится в ходы запрошенного
+уровня. Таблица без rowid с первичным ключом по строке уровня: одна
+запись — это строка уровня и пара чисел, а поиск идёт по B-дереву ключа.
+
+Кэш ограничен max_entries записями; при переполнении удаляются давно
+не использованные (время последнего обращения хранится в записи).
+Попадание кэш только читает: время обращения обновляется, если запись не
+трогали дольше TOUCH_INTERVAL, и копится в памяти, а пишется одной
+транзакцией, когда накопится TOUCH_BATCH записей или пройдёт
+TOUCH_INTERVAL, — иначе каждое попадание ждало бы общую блокировку записи.
+Подключение открывается в том процессе, который будет им пользоваться:
+соединения SQLite нельзя передавать через fork.
+"""
+import json
+import sqlite3
+import time
+from collections import namedtuple
+
+from .canonical import canonical, canonical_transform, map_moves
+
+DEFAULT_PATH = "solve_cache.sqlite3"
+DEFAULT_MAX_ENTRIES = 2_000_000
+# Доля записей, остающихся после вытеснения, — чтобы не вытеснять на каждой вставке
+EVICT_TO = 0.9
+# Как долго ждать блокировку, пока пишет другой процесс
+LOCK_TIMEOUT = 30
+# Время обращения с точностью до TOUCH_INTERVAL секунд вполне годится для вытеснения
+TOUCH_INTERVAL = 60
+TOUCH_BATCH = 1000
+
+CachedSolve = namedtuple('CachedSolve', 'steps nodes solution')
+# lookup() не нашёл годной записи (None — это «решения нет»)
+MISS = object()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS solves (
+    config TEXT NOT NULL,
+    all_slides INTEGER NOT NULL,
+    steps INTEGER,
+    nodes INTEGER,
+    solution TEXT,
+    used REAL NOT NULL,
+    PRIMARY KEY (config, all_slides)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS solves_used ON solves (used);
+"""
+
+
+class SolveCache:
+    def __init__(self, path=DEFAULT_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.connection = sqlite3.connect(path, timeout=LOCK_TIMEOUT, isolation_level=None)
+        # WAL: читатели не ждут писателя, а запись не требует fsync на каждую транзакцию
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.count = self.connection.execute("SELECT COUNT(*) FROM solves").fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+        # (ключ, all_slides) -> время обращения, ещё не записанное в базу
+        self.touched = {}
+        self.flushed = time.time()
+
+    def key(self, config):
+        """Строка уровня, под которой хранится решение"""
+        return canonical(config)
+
+    def get(self, config, all_slides=False):
+        """CachedSolve или None, если уровень ещё не решался"""
+        key, mirrored = canonical_transform(config)
+        row = self.connection.execute(
+            "SELECT steps, nodes, solution, used FROM solves WHERE config = ? AND all_slides = ?",
+            (key, all_slides)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        steps, nodes, solution, used = row
+        self.touch(key, all_slides, used)
+        if solution is not None:
+            solution = [tuple(move) for move in json.loads(solution)]
+            if mirrored:
+                solution = map_moves(solution, key, config)
+        return CachedSolve(steps, nodes, solution)
+
+    def touch(self, key, all_slides, used):
+        """Откладывает обновление времени обращения к записи"""
+        now = time.time()
+        if now - used >= TOUCH_INTERVAL:
+            self.touched[key, all_slides] = now
+        if len(self.touched) >= TOUCH_BATCH or (self.touched and now - self.flushed >= TOUCH_INTERVAL):
+            self.flush()
+
+    def flush(self):
+        """Записывает накопленные времена обращения одной транзакцией"""
+        self.flushed = time.time()
+        if not self.touched:
+            return
+        self.connection.execute("BEGIN")
+        self.connection.executemany(
+            "UPDATE solves SET used = max(used, ?) WHERE config = ? AND all_slides = ?",
+            [(used, key, all_slides) for (key, all_slides), used in self.touched.items()])
+        self.connection.execute("COMMIT")
+        self.touched.clear()
+
+    def put(self, config, steps, all_slides=False, nodes=None, solution=None):
+        """Записывает результат решения; solution — список ходов или None"""
+        key, mirrored = canonical_transform(config)
+        if solution is not None:
+            if mirrored:
+                solution = map_moves(solution, config, key)
+            solution = json.dumps(solution)
+        self.connection.execute(
+            "INSERT INTO solves VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (config, all_slides) DO UPDATE SET "
+            "nodes = coalesce(excluded.nodes, nodes), solution = coalesce(excluded.solution, solution), "
+            "used = excluded.used",
+            (key, all_slides, steps, nodes, solution, time.time()))
+        # Счётчик приблизителен: обновления тоже считаются, evict() его уточняет
+        self.count += 1
+        if self.count > self.max_entries:
+            self.evict()
+
+    def lookup(self, config, all_slides=False, want_path=False):
+        """Готовый результат solve() из кэша или MISS.
+
+        Запись без сохранённого решения не годится, когда нужен путь.
+        """
+        hit = self.get(config, all_slides)
+        if hit is None:
+            return MISS
+        if not want_path or hit.steps is None:
+            return hit.steps
+        return hit.solution if hit.solution is not None else MISS
+
+    def record(self, config, result, all_slides=False, want_path=False, nodes=None):
+        """Записывает результат solve(): список ходов при want_path, иначе длину"""
+        if want_path and result is not None:
+            self.put(config, len(result), all_slides, nodes, result)
+        else:
+            self.put(config, result, all_slides, nodes)
+
+    def put_many(self, results, all_slides=False):
+        """Записывает пары (уровень, длина) одной транзакцией"""
+        now = time.time()
+        self.connection.execute("BEGIN")
+        cursor = self.connection.executemany(
+            "INSERT OR IGNORE INTO solves VALUES (?, ?, ?, NULL, NULL, ?)",
+            [(self.key(config), all_slides, steps, now) for config, steps in results])
+        self.connection.execute("COMMIT")
+        self.count += cursor.rowcount
+        if self.count > self.max_entries:
+            self.evict()
+
+    def evict(self):
+        """Удаляет давно не использованные записи, оставляя долю EVICT_TO"""
+        self.flush()
+        count = self.connection.execute("SELECT COUNT(*) FROM solves").fetchone()[0]
+        excess = count - int(self.max_entries * EVICT_TO)
+        if excess > 0:
+            self.connection.execute(
+                "DELETE FROM solves WHERE (config, all_slides) IN "
+                "(SELECT config, all_slides FROM solves ORDER BY used LIMIT ?)", (excess,))
+        self.count = count - max(excess, 0)
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self.flush()
+        self.connection.close()
@@ -0,0 +1,55 @@
+"""Единая точка входа для решения уровней.
+
+solve() строит Board и вызывает выбранный движок; движки взаимозаменяемы
+и отличаются только скоростью и расходом памяти. Длины решений у всех
+одинаковы. По умолчанию все движки сдвигают машину до упора, как
+генератор; сдвиг на любое расстояние включается явно (all_slides=True).
+"""
+from .astar import AStar
+from .bfs import BFS, Dijkstra
+from .bidirectional import BidirectionalBFS
+from .board import Board
+from .ida import IDAStar
+from .solvecache import MISS
+
+ENGINES = {
+    'bfs': BFS,
+    'bidirectional': BidirectionalBFS,
+    'astar': AStar,
+    'ida': IDAStar,
+    'dijkstra': Dijkstra,
+}
+
+
+def make_engine(name, board, **options):
+    """Создаёт движок по имени для данного поля"""
+    try:
+        engine = ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Неизвестный движок: {name}") from None
+    return engine(board, **options)
+
+
+def solve(level, engine='astar', want_path=True, size=None, all_slides=False, cache=None, **options):
+    """Решает уровень (строку или Board).
+
+    Возвращает список ходов, а при want_path=False — только их количество;
+    None, если решения нет. options передаются движку (например, heuristic
+    или max_depth). all_slides — сдвиг машин на любое расстояние вместо
+    сдвига до упора. cache — SolveCache: уровень-строка сначала ищется в нём,
+    а новый результат записывается туда.
+    """
+    if isinstance(level, Board):
+        return make_engine(engine, level, **options).search(want_path)
+
+    if cache is not None:
+        result = cache.lookup(level, all_slides, want_path)
+        if result is not MISS:
+            return result
+
+    solver = make_engine(engine, Board(level, size, all_slides), **options)
+    result = solver.search(want_path)
+    # Поиск, оборванный на max_depth, точной длины не знает
+    if cache is not None and not solver.cut_off:
+        cache.record(level, result, all_slides, want_path, solver.nodes_expanded)
+    return result
@@ -0,0 +1,101 @@
+"""Полный перебор пространства состояний одной раскладки машин.
+
+Для полей 6x6 и 7x7 множество состояний, достижимых из уровня, обычно
+невелико, поэтому его можно перечислить целиком, а затем одним обратным
+BFS от всех целевых состояний получить точное число ходов до решения для
+каждого из них. Это заменяет отдельный A* на каждую конфигурацию и сразу
+даёт самое трудное начальное состояние компоненты.
+"""
+from array import array
+from bisect import bisect_left
+from collections import deque
+
+UNSOLVABLE = 255
+MAX_STATES = 2000000
+
+
+class StateSpace:
+    def __init__(self, board, start=None, max_states=MAX_STATES):
+        """Перечисляет состояния, достижимые из start, и считает расстояния.
+
+        Все пути из достижимого состояния остаются внутри множества, поэтому
+        обратный поиск, ограниченный им, даёт точные расстояния.
+        Если состояний больше max_states, бросает OverflowError.
+        """
+        self.board = board
+        self.start = board.initial_state if start is None else start
+
+        states = self._enumerate(max_states)
+        states.sort()
+        self.states = array('Q', states)
+        self.distances = self._distances(states)
+
+    def _enumerate(self, max_states):
+        board = self.board
+        seen = {self.start}
+        queue = deque([self.start])
+
+        while queue:
+            for new_state in board.next_states(queue.popleft()):
+                if new_state not in seen:
+                    seen.add(new_state)
+                    queue.append(new_state)
+            if len(seen) > max_states:
+                raise OverflowError(f"Больше {max_states} состояний")
+
+        return list(seen)
+
+    def _distances(self, states):
+        """Обратный BFS сразу от всех целевых состояний"""
+        board = self.board
+        index = {state: i for i, state in enumerate(states)}
+        distances = bytearray([UNSOLVABLE]) * len(states)
+
+        frontier = [i for i, state in enumerate(states) if board.is_solved(state)]
+        for i in frontier:
+            distances[i] = 0
+
+        depth = 0
+        while frontier:
+            depth += 1
+            next_frontier = []
+            for i in frontier:
+                for prev in board.prev_states(states[i]):
+                    j = index.get(prev)
+                    if j is not None and distances[j] == UNSOLVABLE:
+                        distances[j] = depth
+                        next_frontier.append(j)
+            frontier = next_frontier
+
+        return distances
+
+    def __len__(self):
+        return len(self.states)
+
+    def index(self, state):
+        """Номер состояния в отсортированном массиве или -1"""
+        i = bisect_left(self.states, state)
+        if i < len(self.states) and self.states[i] == state:
+            return i
+        return -1
+
+    def distance(self, state):
+        """Оптимальное число ходов до решения, None если решения нет"""
+        i = self.index(state)
+        if i < 0 or self.distances[i] == UNSOLVABLE:
+            return None
+        return self.distances[i]
+
+    def hardest(self):
+        """Состояние с наибольшим расстоянием до решения: (состояние, ходы)"""
+        best = None
+        for i, d in enumerate(self.distances):
+            if d != UNSOLVABLE and (best is None or d > self.distances[best]):
+                best = i
+        if best is None:
+            return None
+        return self.states[best], self.distances[best]
+
+    def states_at(self, distance):
+        """Все состояния с заданным расстоянием до решения"""
+        return [self.states[i] for i, d in enumerate(self.distances) if d == distance]
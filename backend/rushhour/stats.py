@@ -0,0 +1,118 @@
+"""Необязательная статистика поиска.
+
+Движок, созданный со stats=SearchStats(), считает раскрытые и порождённые
+состояния, наибольший размер фронта и сколько состояний хранил; из них
+выводятся средний коэффициент ветвления и доля повторных попаданий. Без
+stats движок делает лишь одну проверку на None на раскрытое состояние.
+
+При sample_every=N генерация ходов и эвристика оборачиваются таймерами,
+которые замеряют каждый N-й вызов; итог оценивается умножением на N, а
+остаток полного времени — это хэширование, очереди и прочая работа.
+"""
+import time
+
+PHASES = ('moves', 'heuristic')
+
+
+class SearchStats:
+    def __init__(self, sample_every=0):
+        self.sample_every = sample_every
+        self.solves = 0
+        self.solved = 0
+        self.expanded = 0
+        self.generated = 0
+        self.stored = 0
+        self.max_frontier = 0
+        self.time = 0.0
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.sampled = dict.fromkeys(PHASES, 0.0)
+
+    def expand(self, generated, frontier):
+        """Учитывает одно раскрытое состояние"""
+        self.expanded += 1
+        self.generated += generated
+        if frontier > self.max_frontier:
+            self.max_frontier = frontier
+
+    def timed(self, phase, function):
+        """Обёртка, замеряющая каждый sample_every-й вызов function"""
+        if not self.sample_every:
+            return function
+        every = self.sample_every
+        calls = self.calls
+        sampled = self.sampled
+        clock = time.perf_counter
+
+        def wrapper(*args):
+            calls[phase] += 1
+            if calls[phase] % every:
+                return function(*args)
+            start = clock()
+            result = function(*args)
+            sampled[phase] += clock() - start
+            return result
+
+        return wrapper
+
+    def finish(self, stored, elapsed, result):
+        """Итоги одного решения"""
+        self.solves += 1
+        self.solved += result is not None
+        self.stored += stored
+        self.time += elapsed
+
+    def merge(self, other):
+        """Добавляет счётчики другого объекта, например, одного решения"""
+        self.solves += other.solves
+        self.solved += other.solved
+        self.expanded += other.expanded
+        self.generated += other.generated
+        self.stored += other.stored
+        self.max_frontier = max(self.max_frontier, other.max_frontier)
+        self.time += other.time
+        for phase in PHASES:
+            self.calls[phase] += other.calls[phase]
+            self.sampled[phase] += other.sampled[phase]
+
+    @property
+    def branching_factor(self):
+        return self.generated / self.expanded if self.expanded else 0.0
+
+    @property
+    def duplicate_rate(self):
+        """Доля порождённых состояний, не давших нового состояния"""
+        if not self.generated:
+            return 0.0
+        new = max(self.stored - self.solves, 0)  # Начальные состояния не порождались
+        return max(self.generated - new, 0) / self.generated
+
+    def phase_times(self):
+        """Оценка полного времени по фазам из выборочных замеров"""
+        times = {phase: self.sampled[phase] * self.sample_every for phase in PHASES}
+        times['other'] = max(self.time - sum(times.values()), 0.0)
+        return times
+
+    def as_dict(self):
+        result = {
+            'solves': self.solves,
+            'solved': self.solved,
+            'expanded': self.expanded,
+            'generated': self.generated,
+            'stored': self.stored,
+            'max_frontier': self.max_frontier,
+            'branching_factor': self.branching_factor,
+            'duplicate_rate': self.duplicate_rate,
+            'time': self.time,
+        }
+        if self.sample_every:
+            result['phase_times'] = self.phase_times()
+        return result
+
+    def __str__(self):
+        line = (f"решений {self.solves} (решено {self.solved}), раскрыто {self.expanded}, "
+                f"ветвление {self.branching_factor:.2f}, повторы {self.duplicate_rate:.0%}, "
+                f"макс. фронт {self.max_frontier}, время {self.time:.2f} сек")
+        if self.sample_every:
+            phases = ', '.join(f"{phase} {seconds:.2f}" for phase, seconds in self.phase_times().items())
+            line += f" ({phases})"
+        return line
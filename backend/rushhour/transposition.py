@@ -0,0 +1,76 @@
+"""Таблица транспозиций фиксированного размера для IDA*.
+
+Для каждого состояния хранится нижняя оценка числа ходов до решения,
+выученная прошлыми проходами поиска: если поддерево состояния на глубине g
+исчерпано с порогом и вернуло минимальное f, превысившее порог, то до
+решения не меньше f - g ходов. Оценки верны для любого порога, поэтому
+таблица не очищается между итерациями IDA*.
+
+Память ограничена заранее: записи лежат в плоских массивах (состояние —
+8 байт, оценка и глубина — по байту). Ячейки объединены в пары: первая
+сохраняет запись с самым большим исследованным поддеревом, вторая
+перезаписывается всегда. Номер пары выбирается по ключу Цобриста, а
+упакованное состояние в ячейке проверяет совпадение.
+"""
+from array import array
+
+ENTRY_BYTES = 10
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+MAX_VALUE = 255
+INF = float('inf')
+EMPTY_SLOT = (1 << 64) - 1  # упакованное состояние занимает не больше 63 бит
+
+
+class TranspositionTable:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.buckets = max(1, max_bytes // (2 * ENTRY_BYTES))
+        size = 2 * self.buckets
+        self.states = array('Q', [EMPTY_SLOT]) * size
+        self.bounds = bytearray(size)
+        self.depths = bytearray(size)
+        self.stored = 0
+
+    def __len__(self):
+        return self.stored
+
+    def lookup(self, key, state):
+        """Выученная нижняя оценка для state или 0, если записи нет"""
+        slot = 2 * (key % self.buckets)
+        if self.states[slot] == state:
+            bound = self.bounds[slot]
+        elif self.states[slot + 1] == state:
+            bound = self.bounds[slot + 1]
+        else:
+            return 0
+        # Насыщенное значение означает, что решения из состояния нет
+        return INF if bound == MAX_VALUE else bound
+
+    def store(self, key, state, bound, depth):
+        """Запоминает оценку bound; depth — размер исследованного поддерева"""
+        bound = MAX_VALUE if bound == INF else min(bound, MAX_VALUE - 1)
+        depth = min(depth, MAX_VALUE)
+        slot = 2 * (key % self.buckets)
+        states = self.states
+
+        for i in (slot, slot + 1):
+            if states[i] == state:
+                if bound > self.bounds[i]:
+                    self.bounds[i] = bound
+                if depth > self.depths[i]:
+                    self.depths[i] = depth
+                return
+
+        if states[slot] == EMPTY_SLOT or depth >= self.depths[slot]:
+            if states[slot] != EMPTY_SLOT and states[slot + 1] == EMPTY_SLOT:
+                # Вытесняемая запись переезжает во второй ярус, а не теряется
+                self._write(slot + 1, states[slot], self.bounds[slot], self.depths[slot])
+            self._write(slot, state, bound, depth)
+        else:
+            self._write(slot + 1, state, bound, depth)
+
+    def _write(self, i, state, bound, depth):
+        if self.states[i] == EMPTY_SLOT:
+            self.stored += 1
+        self.states[i] = state
+        self.bounds[i] = bound
+        self.depths[i] = depth
@@ -0,0 +1,33 @@
+"""Ключи Цобриста для состояний.
+
+Упакованное состояние (см. board) само является целым числом и служит
+точным ключом для множеств и словарей посещённых состояний. Но как индекс
+в таблице фиксированного размера оно плохо: младшие биты — это позиции
+красной и первых машин, и состояния одной ветки поиска попадают в соседние
+ячейки. Ключ Цобриста — XOR случайных 64-битных чисел по парам (машина,
+позиция): он распределён равномерно и при сдвиге машины обновляется за O(1).
+"""
+import random
+
+KEY_BITS = 64
+ZOBRIST_SEED = 0x52484B  # фиксирован, чтобы ключи совпадали во всех процессах
+
+
+class Zobrist:
+    def __init__(self, board, seed=ZOBRIST_SEED):
+        self.board = board
+        rng = random.Random(seed)
+        self.keys = [[rng.getrandbits(KEY_BITS) for _ in board.masks[car]]
+                     for car in range(board.car_count)]
+
+    def key(self, state):
+        """Полный ключ состояния за O(машин)"""
+        key = 0
+        for car, position in enumerate(self.board.positions(state)):
+            key ^= self.keys[car][position]
+        return key
+
+    def update(self, key, car, old, new):
+        """Ключ после сдвига машины car с позиции old на new"""
+        keys = self.keys[car]
+        return key ^ keys[old] ^ keys[new]
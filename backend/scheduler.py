@@ -0,0 +1,159 @@
+"""Параллельная генерация уровней всех размеров на всех ядрах.
+
+Рабочие процессы не привязаны к размеру поля: для каждой попытки они
+берут любую ещё открытую квоту (размер, сложность), генерируют и решают
+кандидатов и отправляют найденные уровни координатору. Координатор —
+основной процесс — отбрасывает повторы, пишет уровни в LevelStore, пока
+квота не закрыта, публикует остатки квот в общем массиве и останавливает
+рабочих, когда закрыты все. Освободившиеся рабочие сами переходят к медленным
+размерам, поэтому время генерации определяется числом ядер, а не 7x7.
+
+Запуск из каталога backend:
+    python scheduler.py --workers 8 --sizes 5x5,6x6,7x7
+"""
+import argparse
+import multiprocessing as mp
+import os
+import queue
+import random
+import time
+
+from generator import DIFFICULTIES, LEVELS_PER_DIFFICULTY, make_generator
+from bloom import SharedBloomFilter
+from levelstore import CHECKPOINT_LEVELS, LevelStore, known_configs
+from rushhour import FIELD_SIZES
+from rushhour.canonical import canonical
+from rushhour.pdb import load_all as load_pattern_databases
+
+# Сколько ждать рабочих, дорешивающих последних кандидатов, после остановки
+JOIN_TIMEOUT = 30
+POLL_INTERVAL = 0.5
+
+
+def worker(quotas, remaining, results, stop, seen):
+    """Рабочий процесс: решает кандидатов для открытых квот, пока не поднят stop.
+
+    Квота выбирается заново на каждую попытку с весом по остатку; остатки
+    пишет только координатор, рабочий лишь читает их. seen — общий фильтр
+    виденных конфигураций, поэтому рабочие не решают одно и то же.
+    """
+    random.seed()  # После fork у всех процессов одинаковое состояние random
+    load_pattern_databases()
+    generators = {}
+
+    while not stop.is_set():
+        open_quotas = [i for i, left in enumerate(remaining) if left > 0]
+        if not open_quotas:
+            break
+        index = random.choices(open_quotas, weights=[remaining[i] for i in open_quotas])[0]
+        size, difficulty_target = quotas[index]
+        if size not in generators:
+            generators[size] = make_generator(size, seen)
+        generator = generators[size]
+        generator.open_difficulties = [d for d in DIFFICULTIES if remaining[quotas.index((size, d))] > 0]
+
+        for config, difficulty, steps in generator.produce(difficulty_target):
+            if remaining[quotas.index((size, difficulty))] > 0:
+                results.put((size, difficulty, config, steps, generator.attempts))
+                if generator.stats is not None:
+                    generator.print_stats()
+
+
+def shutdown(processes, results, timeout=JOIN_TIMEOUT):
+    """Дожидается рабочих, вычитывая очередь.
+
+    Процесс, чьи данные ещё не ушли в очередь, не может завершиться,
+    поэтому очередь читается до конца; зависшие рабочие снимаются.
+    """
+    deadline = time.time() + timeout
+    while any(p.is_alive() for p in processes) and time.time() < deadline:
+        try:
+            results.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            pass
+    for p in processes:
+        if p.is_alive():
+            p.terminate()
+        p.join()
+
+
+def run(sizes=tuple(FIELD_SIZES), workers=None):
+    """Генерирует по LEVELS_PER_DIFFICULTY новых уровней каждой сложности для sizes"""
+    workers = workers or os.cpu_count()
+    quotas = [(size, difficulty) for size in sizes for difficulty in DIFFICULTIES]
+    remaining = mp.Array('i', [LEVELS_PER_DIFFICULTY] * len(quotas), lock=False)
+    results = mp.Queue()
+    stop = mp.Event()
+
+    # Координатор — единственный, кто пишет уровни
+    store = LevelStore()
+    saved = set()
+    for size in sizes:
+        saved.update(canonical(config, size) for config in known_configs(size, DIFFICULTIES))
+    accepted = 0
+    # Общий для рабочих фильтр; известные уровни отмечены заранее
+    seen = SharedBloomFilter()
+    seen.update(saved)
+
+    # Базы образцов строятся один раз здесь, а рабочие открывают
+    # готовые файлы через mmap и делят страницы между собой
+    load_pattern_databases()
+    processes = [mp.Process(target=worker, args=(quotas, remaining, results, stop, seen), daemon=True)
+                 for _ in range(workers)]
+    for p in processes:
+        p.start()
+    print(f"Рабочих процессов: {workers}", flush=True)
+
+    try:
+        while any(remaining):
+            try:
+                size, difficulty, config, steps, attempts = results.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                if not any(p.is_alive() for p in processes):
+                    raise RuntimeError("Все рабочие процессы завершились до закрытия квот")
+                continue
+
+            index = quotas.index((size, difficulty))
+            key = canonical(config, size)
+            if remaining[index] <= 0 or key in saved:
+                continue  # Квота закрыта или уровень уже сохранён
+            saved.add(key)
+            store.append(size, difficulty, config, steps)
+            remaining[index] -= 1
+            accepted += 1
+            if accepted % CHECKPOINT_LEVELS == 0:
+                store.export()
+
+            done = ', '.join(
+                f"{d.capitalize()}: {LEVELS_PER_DIFFICULTY - remaining[quotas.index((size, d))]}"
+                f"/{LEVELS_PER_DIFFICULTY}" for d in DIFFICULTIES)
+            print(f"{size}: {difficulty.upper()} ({steps} шагов, попытка #{attempts} рабочего) | {done}",
+                  flush=True)
+    finally:
+        stop.set()
+        shutdown(processes, results)
+        store.close()
+        seen.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Параллельная генерация уровней")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="число рабочих процессов (по умолчанию — число ядер)")
+    parser.add_argument('--sizes', default=','.join(FIELD_SIZES), help="размеры поля через запятую")
+    args = parser.parse_args()
+
+    sizes = args.sizes.split(',')
+    for size in sizes:
+        if size not in FIELD_SIZES:
+            parser.error(f"неизвестный размер поля: {size}")
+
+    print("Запуск параллельной генерации...", flush=True)
+    start_time = time.time()
+    run(sizes, args.workers)
+    total_time = time.time() - start_time
+    print(f"Все уровни сгенерированы за {total_time:.1f} секунд", flush=True)
+
+
+if __name__ == "__main__":
+    main()
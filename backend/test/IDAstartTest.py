@@ -1,286 +1,37 @@
-from functools import lru_cache
 import time
 import tracemalloc
+import os
 import sys
 import io
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from rushhour import Board, make_engine
+from rushhour.transposition import DEFAULT_MAX_BYTES
+
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
 class RushHourIDAStar:
-    def __init__(self, level_str):
+    def __init__(self, level_str, heuristic='max', max_table_bytes=DEFAULT_MAX_BYTES):
         self.level_str = level_str
-        # Инициализируем словари для отображения символов в ID и обратно
-        self.char_to_id = {'A': 1}  # Красная машина всегда имеет id 1
-        self.id_to_char = {1: 'A'}
-        self.grid_params = self.get_grid_params()
-        self.rows, self.cols, self.target_row, self.exit_col = self.grid_params
-        self.grid = self.convert_level_to_grid()
-        self.cars = self.parse_cars()
-        self.nodes_expanded = 0
-        self.memory_cache = {}
-        self.best_solution = None
-        self.solution_found = False
-        
-    def get_grid_params(self):
-        """Определяет параметры поля по длине строки уровня"""
-        length = len(self.level_str)
-        if length == 25:  # 5x5
-            return (5, 5, 2, 5)  # rows, cols, exit_row, exit_col
-        elif length == 36:  # 6x6
-            return (6, 6, 2, 6)
-        elif length == 49:  # 7x7
-            return (7, 7, 3, 7)
-        else:
-            raise ValueError(f"Неподдерживаемый размер поля: длина строки {length}")
-
-    def convert_level_to_grid(self):
-        """Конвертирует строку уровня в числовую сетку"""
-        grid = [[0 for _ in range(self.cols + 1)] for _ in range(self.rows)]  # +1 для выхода
-        next_id = 2  # Начинаем с 2, так как 1 уже занята красной машиной
-
-        for i, char in enumerate(self.level_str):
-            row = i // self.cols
-            col = i % self.cols
-            if char == 'o':
-                grid[row][col] = 0  # Пустая клетка
-            elif char == 'x':
-                grid[row][col] = -1  # Стена
-            else:
-                if char not in self.char_to_id:
-                    self.char_to_id[char] = next_id
-                    self.id_to_char[next_id] = char
-                    next_id += 1
-                grid[row][col] = self.char_to_id[char]
-
-        # Добавляем выход для красной машины
-        grid[self.target_row][self.exit_col] = 99
-        return grid
-
-    def parse_cars(self):
-        """Анализирует сетку и возвращает словарь машин"""
-        cars = {}
-        positions = {}
-
-        for row in range(self.rows):
-            for col in range(self.cols):
-                cell = self.grid[row][col]
-                if cell > 0:  # 0 - пусто, -1 - стена, >0 - машины
-                    positions.setdefault(cell, []).append((row, col))
+        self.board = Board(level_str, all_slides=True)
+        self.engine = make_engine('ida', self.board, heuristic=heuristic, max_table_bytes=max_table_bytes)
 
-        for car_id, pos_list in positions.items():
-            pos_list.sort()
-            # Определяем ориентацию (горизонтальная/вертикальная)
-            is_horizontal = pos_list[0][0] == pos_list[-1][0]
-            length = len(pos_list)
-            cars[car_id] = {
-                'id': car_id,
-                'orientation': 'h' if is_horizontal else 'v',
-                'row': pos_list[0][0],
-                'col': pos_list[0][1],
-                'length': length
-            }
+    @property
+    def nodes_expanded(self):
+        return self.engine.nodes_expanded
 
-        return cars
-
-    def is_goal(self, cars):
+    def is_goal(self, state):
         """Проверяет, достигнуто ли целевое состояние"""
-        red_car = cars.get(1)  # Красная машина всегда имеет id 1
-        if not red_car:
-            return False
-        return (red_car['orientation'] == 'h' and 
-                red_car['row'] == self.target_row and 
-                red_car['col'] + red_car['length'] == self.exit_col)
-
-    def heuristic(self, cars):
-        """Эвристическая функция для IDA*"""
-        red_car = cars.get(1)
-        if not red_car or red_car['orientation'] != 'h' or red_car['row'] != self.target_row:
-            return float('inf')
-
-        # Создаем временную сетку для анализа блокировок
-        grid = [[0 for _ in range(self.cols)] for _ in range(self.rows)]
-        for car in cars.values():
-            if car['orientation'] == 'h':
-                for i in range(car['length']):
-                    if car['col'] + i < self.cols:
-                        grid[car['row']][car['col'] + i] = car['id']
-            else:
-                for i in range(car['length']):
-                    grid[car['row'] + i][car['col']] = car['id']
-
-        # Подсчитываем блокирующие машины
-        blocking = 0
-        exit_pos = red_car['col'] + red_car['length']
-        for col in range(exit_pos, self.cols):
-            if grid[self.target_row][col] != 0:
-                blocking += 1
-                # Дополнительный вес для вертикальных машин
-                if cars.get(grid[self.target_row][col], {}).get('orientation') == 'v':
-                    blocking += 1
-
-        return blocking + (self.exit_col - exit_pos)
-
-    def get_moves(self, cars):
-        """Генерирует все возможные ходы для текущего состояния"""
-        if self.solution_found:
-            return []
-
-        # Создаем временную сетку для проверки перемещений
-        grid = [[0 for _ in range(self.cols)] for _ in range(self.rows)]
-        for car in cars.values():
-            if car['orientation'] == 'h':
-                for i in range(car['length']):
-                    if car['col'] + i < self.cols:
-                        grid[car['row']][car['col'] + i] = car['id']
-            else:
-                for i in range(car['length']):
-                    grid[car['row'] + i][car['col']] = car['id']
-
-        moves = []
-        for car_id, car in cars.items():
-            if car['orientation'] == 'h':
-                # Движение влево
-                move_dist = 0
-                while (car['col'] - move_dist - 1 >= 0 and 
-                    grid[car['row']][car['col'] - move_dist - 1] <= 0):  # Проверяем <= 0 (пусто или стена)
-                    if grid[car['row']][car['col'] - move_dist - 1] == -1:  # Если стена - прерываем
-                        break
-                    move_dist += 1
-                    if move_dist > 0:
-                        moves.append((car_id, 'left', move_dist))
+        return self.board.is_solved(state)
 
-                # Движение вправо
-                move_dist = 0
-                while (car['col'] + car['length'] + move_dist < self.cols and 
-                    grid[car['row']][car['col'] + car['length'] + move_dist] <= 0):
-                    if grid[car['row']][car['col'] + car['length'] + move_dist] == -1:
-                        break
-                    move_dist += 1
-                    if move_dist > 0:
-                        moves.append((car_id, 'right', move_dist))
-                # Особый случай для красной машины и выхода
-                if (car_id == 1 and 
-                    car['col'] + car['length'] + move_dist == self.cols):
-                    moves.append((car_id, 'right', move_dist + 1))
-            else:
-                # Движение вверх
-                move_dist = 0
-                while (car['row'] - move_dist - 1 >= 0 and 
-                    grid[car['row'] - move_dist - 1][car['col']] <= 0):
-                    if grid[car['row'] - move_dist - 1][car['col']] == -1:
-                        break
-                    move_dist += 1
-                    if move_dist > 0:
-                        moves.append((car_id, 'up', move_dist))
-
-                # Движение вниз
-                move_dist = 0
-                while (car['row'] + car['length'] + move_dist < self.rows and 
-                    grid[car['row'] + car['length'] + move_dist][car['col']] <= 0):
-                    if grid[car['row'] + car['length'] + move_dist][car['col']] == -1:
-                        break
-                    move_dist += 1
-                    if move_dist > 0:
-                        moves.append((car_id, 'down', move_dist))
-
-        return moves
-
-    def apply_move(self, cars, move):
-        """Применяет ход и возвращает новое состояние машин"""
-        car_id, direction, dist = move
-        new_cars = {cid: {**car} for cid, car in cars.items()}
-        car = new_cars[car_id]
-
-        # Проверяем, нет ли стен на пути
-        if direction == 'left':
-            for d in range(1, dist+1):
-                if self.grid[car['row']][car['col'] - d] == -1:
-                    return None  # Недопустимый ход - стена на пути
-        elif direction == 'right':
-            for d in range(1, dist+1):
-                if car['col'] + car['length'] - 1 + d >= self.cols:
-                    continue  # Выход за пределы - допустимо для красной машины
-                if self.grid[car['row']][car['col'] + car['length'] - 1 + d] == -1:
-                    return None
-        elif direction == 'up':
-            for d in range(1, dist+1):
-                if self.grid[car['row'] - d][car['col']] == -1:
-                    return None
-        elif direction == 'down':
-            for d in range(1, dist+1):
-                if self.grid[car['row'] + car['length'] - 1 + d][car['col']] == -1:
-                    return None
-
-        # Применяем ход, если он допустим
-        if direction == 'left':
-            car['col'] -= dist
-        elif direction == 'right':
-            car['col'] += dist
-        elif direction == 'up':
-            car['row'] -= dist
-        elif direction == 'down':
-            car['row'] += dist
-
-        return new_cars
+    def apply_move(self, state, move):
+        """Применяет ход и возвращает новое состояние"""
+        return self.board.apply_move(state, move)
 
     def solve(self):
         """Основной метод решения с использованием IDA*"""
-        initial_cars = {car['id']: car for car in self.cars.values()}
-        threshold = self.heuristic(initial_cars)
-        
-        while not self.solution_found:
-            self.memory_cache = {}  # Очищаем кеш для новой итерации
-            result = self.ida_star(initial_cars, [], 0, threshold)
-            if self.solution_found:
-                return self.best_solution
-            if result == float('inf'):
-                return None  # Решение не найдено
-            threshold = result  # Увеличиваем порог для следующей итерации
-
-    def ida_star(self, cars, path, g, threshold):
-        """Рекурсивная функция поиска с итеративным углублением"""
-        if self.solution_found:
-            return float('inf')
-
-        self.nodes_expanded += 1
-        h = self.heuristic(cars)
-        f = g + h
-
-        if f > threshold:
-            return f
-        if self.is_goal(cars):
-            self.solution_found = True
-            self.best_solution = path.copy()
-            return "FOUND"
-
-        # Создаем ключ состояния для кеширования
-        state_key = tuple((cid, car['orientation'], car['row'], car['col']) 
-                    for cid, car in sorted(cars.items()))
-        
-        # Проверяем, не посещали ли мы это состояние с лучшим или равным g
-        if state_key in self.memory_cache:
-            if self.memory_cache[state_key] <= g:
-                return float('inf')
-        self.memory_cache[state_key] = g
-
-        min_threshold = float('inf')
-        moves = self.get_moves(cars)
-        # Сортируем ходы по улучшению эвристики, фильтруя недопустимые
-        moves.sort(key=lambda move: self.heuristic(self.apply_move(cars, move)) 
-                if self.apply_move(cars, move) is not None else float('inf'))
-
-        for move in moves:
-            new_cars = self.apply_move(cars, move)
-            if new_cars is None:  # Пропускаем недопустимые ходы
-                continue
-            result = self.ida_star(new_cars, path + [move], g + 1, threshold)
-            
-            if self.solution_found:
-                return "FOUND"
-            if result < min_threshold:
-                min_threshold = result
-
-        return min_threshold
+        return self.engine.search()
 
     def print_solution(self, solution):
         """Выводит решение в удобочитаемом формате"""
@@ -289,21 +40,21 @@ class RushHourIDAStar:
             return
         
         # Проверяем, когда действительно достигнуто целевое состояние
-        cars = {car['id']: car for car in self.cars.values()}
+        state = self.board.initial_state
         optimal_path = []
         
         for i, move in enumerate(solution):
-            cars = self.apply_move(cars, move)
+            state = self.apply_move(state, move)
             optimal_path.append(move)
-            if self.is_goal(cars):
+            if self.is_goal(state):
                 print(f"Найдено оптимальное решение за {len(optimal_path)} шагов (рассмотрено {self.nodes_expanded} состояний):")
                 for step, (cid, dir, dist) in enumerate(optimal_path, 1):
-                    print(f"Шаг {step}: Машина {self.id_to_char.get(cid, str(cid))} → {dir} на {dist}")
+                    print(f"Шаг {step}: Машина {self.board.letters[cid]} → {dir} на {dist}")
                 return
         
         print(f"Найдено решение за {len(solution)} шагов (рассмотрено {self.nodes_expanded} состояний):")
         for i, (cid, dir, dist) in enumerate(solution, 1):
-            print(f"Шаг {i}: Машина {self.id_to_char.get(cid, str(cid))} → {dir} на {dist}")
+            print(f"Шаг {i}: Машина {self.board.letters[cid]} → {dir} на {dist}")
 
 if __name__ == "__main__":
     # Примеры уровней для разных размеров
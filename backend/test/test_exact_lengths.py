@@ -0,0 +1,94 @@
+"""Точность длин решений на уровнях из frontend/src/levels.
+
+Сложность уровня определяется длиной решения, поэтому эвристики depth,
+pdb и max не должны переоценивать число ходов, движки — находить не
+кратчайшее решение, а prefilter — отбрасывать нужные уровни. Всё
+сверяется с точными расстояниями StateSpace при обеих семантиках ходов.
+
+Запуск из каталога backend:
+    python -m pytest test
+"""
+import os
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from rushhour import Board, ENGINES, FIELD_SIZES, StateSpace, UNSOLVABLE, solve
+from rushhour import prefilter
+from rushhour.heuristics import INF, make_heuristic
+
+LEVELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'frontend', 'src', 'levels')
+SIZES = ('5x5', '6x6')
+DIFFICULTIES = ('easy', 'medium', 'hard')
+LEVELS_PER_FILE = 2
+ADMISSIBLE = ('depth', 'pdb', 'max')
+HEURISTIC_ENGINES = ('astar', 'ida')
+
+
+def shipped_levels():
+    levels = []
+    for size in SIZES:
+        for difficulty in DIFFICULTIES:
+            with open(os.path.join(LEVELS_DIR, f"{difficulty}_{size}.js"), 'r', encoding='utf-8') as f:
+                configs = re.findall(r'"([^"]+)"', f.read())
+            levels.extend((size, config) for config in configs[:LEVELS_PER_FILE])
+    return levels
+
+
+LEVELS = shipped_levels()
+_spaces = {}
+
+
+def state_space(config, size, all_slides):
+    key = (config, all_slides)
+    if key not in _spaces:
+        _spaces[key] = StateSpace(Board(config, size, all_slides))
+    return _spaces[key]
+
+
+@pytest.fixture(params=[False, True], ids=['to_end', 'any_distance'])
+def all_slides(request):
+    return request.param
+
+
+@pytest.mark.parametrize('size,config', LEVELS)
+@pytest.mark.parametrize('heuristic', ADMISSIBLE)
+def test_heuristic_admissible(size, config, heuristic, all_slides):
+    space = state_space(config, size, all_slides)
+    h = make_heuristic(heuristic, space.board)
+    for state, distance in zip(space.states, space.distances):
+        estimate = h(state)
+        if distance == UNSOLVABLE:
+            continue
+        assert estimate != INF, f"{heuristic} считает решаемое состояние тупиком"
+        assert estimate <= distance
+
+
+@pytest.mark.parametrize('size,config', LEVELS)
+@pytest.mark.parametrize('engine', ENGINES)
+def test_engine_exact(size, config, engine, all_slides):
+    expected = state_space(config, size, all_slides).distance(Board(config, size).initial_state)
+    heuristics = ADMISSIBLE if engine in HEURISTIC_ENGINES else (None,)
+    for heuristic in heuristics:
+        options = {'heuristic': heuristic} if heuristic else {}
+        assert solve(config, engine, want_path=False, size=size, all_slides=all_slides, **options) == expected
+
+
+@pytest.mark.parametrize('size,config', LEVELS)
+def test_prefilter_keeps_open_bands(size, config, all_slides):
+    board = Board(config, size, all_slides)
+    expected = state_space(config, size, all_slides).distance(board.initial_state)
+    t = FIELD_SIZES[size]['thresholds']
+    bands = {d: (t[f'{d.upper()}_MIN'], t.get(f'{d.upper()}_MAX')) for d in DIFFICULTIES}
+    for open_difficulties in (DIFFICULTIES, ('easy',), ('medium',), ('hard',), ('easy', 'medium')):
+        open_bands = [bands[d] for d in open_difficulties]
+        verdict = prefilter.screen(board, open_bands)
+        if verdict is prefilter.UNKNOWN:
+            continue
+        if verdict is prefilter.REJECT:
+            assert not any(low <= expected <= (high or expected) for low, high in open_bands)
+        else:
+            assert verdict == expected
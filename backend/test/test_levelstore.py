@@ -0,0 +1,78 @@
+"""Выгрузка уровней из журнала LevelStore в .js-файлы frontend/src/levels.
+
+Запуск из каталога backend:
+    python -m pytest test
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import levelstore
+from levelstore import LevelStore, level_file, read_journal, read_level_file
+
+EXISTING = ["oCCCNHoFFNHAADELGoDELGBBB", "oBICCDBIGoDAAGFDHHHFoEEEo"]
+NEW = "oxxooFCCBBFJAAIHJxxIHDDEE"
+
+
+@pytest.fixture
+def store(tmp_path):
+    levels_dir = tmp_path / 'levels'
+    levels_dir.mkdir()
+    body = '\n,\n'.join(f'"{config}"' for config in EXISTING)
+    (levels_dir / 'easy_5x5.js').write_text(f"export const easyLevels_5x5 = [\n{body}\n]", encoding='utf-8')
+    store = LevelStore(str(tmp_path / 'journal.jsonl'), str(levels_dir))
+    yield store
+    if not store.file.closed:
+        store.file.close()
+
+
+def test_export_keeps_name_and_layout(store):
+    store.append('5x5', 'easy', NEW, 8)
+    store.export()
+
+    path = level_file('5x5', 'easy', store.levels_dir)
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    body = '\n,\n'.join(f'"{config}"' for config in EXISTING + [NEW])
+    assert content == f"export const easyLevels_5x5 = [\n{body}\n]"
+
+
+def test_export_skips_present_levels(store):
+    store.append('5x5', 'easy', EXISTING[0], 7)
+    store.append('5x5', 'easy', NEW, 8)
+    store.append('5x5', 'easy', NEW, 8)
+    store.export()
+    store.export()
+
+    path = level_file('5x5', 'easy', store.levels_dir)
+    assert read_level_file(path) == ('easyLevels_5x5', EXISTING + [NEW])
+
+
+def test_export_creates_missing_file(store):
+    store.append('5x5', 'hard', NEW, 17)
+    store.export()
+
+    path = level_file('5x5', 'hard', store.levels_dir)
+    assert read_level_file(path) == ('hardLevels_5x5', [NEW])
+
+
+def test_close_truncates_journal_after_export(store, monkeypatch):
+    store.append('5x5', 'easy', NEW, 8)
+
+    def fail(path, name, configs):
+        raise OSError("диск заполнен")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(levelstore, 'write_level_file', fail)
+        with pytest.raises(OSError):
+            store.close()
+    # Выгрузка не удалась: журнал остался, и уровень не потерян
+    assert [r['config'] for r in read_journal(store.journal)] == [NEW]
+
+    store = LevelStore(store.journal, store.levels_dir)
+    store.close()
+    assert read_journal(store.journal) == []
+    assert read_level_file(level_file('5x5', 'easy', store.levels_dir))[1] == EXISTING + [NEW]
@@ -0,0 +1,71 @@
+"""Решения из SolveCache для отражённых уровней.
+
+Кэш хранит решение канонического вида, а уровень и его отражение по
+вертикали имеют один канонический вид, поэтому решение одного из них
+выдаётся для другого через map_moves. Каждый выданный ход должен быть
+допустим на отражённом поле, а последний — решать его.
+
+Запуск из каталога backend:
+    python -m pytest test
+"""
+import os
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from rushhour import Board, SolveCache, solve
+from rushhour.canonical import canonical_transform, mirror
+from rushhour.solvecache import MISS
+
+LEVELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'frontend', 'src', 'levels')
+# Отражение сохраняет строку выхода только на полях с нечётной высотой
+SIZES = ('5x5', '7x7')
+LEVELS_PER_SIZE = 3
+
+
+def shipped_levels():
+    levels = []
+    for size in SIZES:
+        with open(os.path.join(LEVELS_DIR, f"medium_{size}.js"), 'r', encoding='utf-8') as f:
+            configs = re.findall(r'"([^"]+)"', f.read())
+        levels.extend((size, config) for config in configs[:LEVELS_PER_SIZE])
+    return levels
+
+
+def replay(config, size, moves, all_slides):
+    """Проигрывает ходы на поле, проверяя каждый; возвращает итоговое состояние"""
+    board = Board(config, size, all_slides)
+    state = board.initial_state
+    for move in moves:
+        legal = dict(board.successors(state))
+        assert move in legal, f"Недопустимый ход {move} на {board.to_config(state)}"
+        state = legal[move]
+    return board, state
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SolveCache(str(tmp_path / 'solves.sqlite3'))
+    yield cache
+    cache.close()
+
+
+@pytest.mark.parametrize('size,config', shipped_levels())
+@pytest.mark.parametrize('all_slides', [False, True], ids=['to_end', 'any_distance'])
+@pytest.mark.parametrize('stored_first', ['level', 'mirror'])
+def test_mirrored_solution_is_legal(cache, size, config, all_slides, stored_first):
+    mirrored = mirror(config, size)
+    stored, looked_up = (config, mirrored) if stored_first == 'level' else (mirrored, config)
+    # Одна из двух записей проходит через отражение при записи, другая — при чтении
+    assert canonical_transform(config, size)[1] != canonical_transform(mirrored, size)[1]
+
+    solution = solve(stored, 'astar', size=size, all_slides=all_slides, cache=cache)
+    moves = cache.lookup(looked_up, all_slides, want_path=True)
+    assert moves is not MISS
+    assert len(moves) == len(solution)
+
+    board, state = replay(looked_up, size, moves, all_slides)
+    assert board.is_solved(state)
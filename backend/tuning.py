@@ -0,0 +1,63 @@
+"""Подстройка параметров случайной расстановки под открытые квоты.
+
+Доля стен, доля вертикальных и длинных машин и предел числа машин
+определяют, какие длины решений получаются у случайных уровней. KnobTuner
+выбирает их сэмплированием Томпсона: для каждого значения каждого
+параметра копятся найденные уровни и затраченное процессорное время, а
+частота находок (уровней в секунду) имеет гамма-апостериорное
+распределение. Для очередной попытки из распределения каждого значения
+берётся выборка, и у каждого параметра выбирается значение с наибольшей
+— так генерация смещается к значениям, дающим больше нужных уровней в
+секунду, но и остальные время от времени пробуются.
+
+Параметры считаются независимыми. Находкой считается уровень любой
+открытой сложности; набор открытых сложностей меняется по мере
+заполнения квот, и для каждого набора статистика своя.
+"""
+import random
+from collections import namedtuple
+
+Knobs = namedtuple('Knobs', 'wall_probability vertical_share long_share car_limit')
+
+WALL_PROBABILITIES = (0.0, 0.05, 0.1, 0.15, 0.2, 0.25)
+VERTICAL_SHARES = (0.5, 0.6, 0.7, 0.8)
+LONG_SHARES = (0.3, 0.4, 0.5, 0.6)
+CAR_LIMITS = {'5x5': (7, 9, 11, 13), '6x6': (10, 12, 14, 17), '7x7': (13, 16, 19, 21)}
+
+# Априорная частота находок значения — общая частота по всем значениям
+# параметра, как если бы за неё была PRIOR_HITS находка; пока находок
+# не было, считается, что одна найдётся за PRIOR_SECONDS секунд
+PRIOR_HITS = 1
+PRIOR_SECONDS = 1.0
+
+
+class KnobTuner:
+    def __init__(self, size):
+        self.values = Knobs(WALL_PROBABILITIES, VERTICAL_SHARES, LONG_SHARES, CAR_LIMITS[size])
+        # {открытые сложности: [по параметру {значение: [находки, секунды]}]}
+        self.totals = {}
+
+    def _totals(self, open_difficulties):
+        key = tuple(open_difficulties)
+        if key not in self.totals:
+            self.totals[key] = [{value: [0, 0.0] for value in values} for values in self.values]
+        return self.totals[key]
+
+    def choose(self, open_difficulties):
+        """Параметры для очередной попытки"""
+        chosen = []
+        for totals in self._totals(open_difficulties):
+            hits = sum(h for h, _ in totals.values())
+            seconds = sum(s for _, s in totals.values())
+            # Секунд на находку в среднем по параметру — вес априорной находки
+            prior = (PRIOR_SECONDS + seconds) / (PRIOR_HITS + hits) * PRIOR_HITS
+            chosen.append(max(totals, key=lambda value: random.gammavariate(
+                PRIOR_HITS + totals[value][0], 1 / (prior + totals[value][1]))))
+        return Knobs(*chosen)
+
+    def update(self, open_difficulties, knobs, hits, seconds):
+        """Учитывает итог попытки: hits уровней нужных сложностей за seconds"""
+        for totals, value in zip(self._totals(open_difficulties), knobs):
+            totals[value][0] += hits
+            totals[value][1] += seconds
+